@@ -0,0 +1,464 @@
+"""
+Общая подсистема замеров производительности для лабораторных работ.
+
+Замер: прогрев, автоподбор числа вызовов number, повторы с отключенным
+сборщиком мусора, медиана, межквартильный размах и доверительный интервал
+медианы. Результаты сохраняются в JSON и сравниваются между коммитами.
+matplotlib импортируется только при построении графика.
+
+Запуск из командной строки:
+    python bench.py list
+    python bench.py run factorial --sizes 100 200 --json out.json --csv out.csv --plot out.png
+    python bench.py compare old.json new.json
+    python bench.py memory tree --sizes 8 12 16 --plot memory.png
+"""
+import argparse
+import csv
+import gc
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+Measurement = namedtuple(
+    "Measurement",
+    ["name", "param", "number", "times", "median", "iqr", "ci_low", "ci_high"],
+)
+
+MemoryMeasurement = namedtuple(
+    "MemoryMeasurement",
+    ["name", "param", "items", "peak_bytes", "retained_bytes", "bytes_per_item"],
+)
+
+
+def calibrate(func: Callable[[], object], min_time: float = 0.2) -> int:
+    """Подбирает number (1, 2, 5, 10, 20, ...), при котором серия длится не меньше min_time."""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            current = number * factor
+            if timer.timeit(current) >= min_time:
+                return current
+        number *= 10
+
+
+def median_ci(times: List[float], z: float = 1.96) -> tuple:
+    """
+    Доверительный интервал медианы по порядковым статистикам
+    (непараметрический, нормальное приближение биномиального распределения).
+    """
+    ordered = sorted(times)
+    n = len(ordered)
+    half = z * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half))
+    high = min(n - 1, math.ceil(n / 2 + half) - 1)
+    return ordered[low], ordered[high]
+
+
+def summarize(name: str, param, number: int, times: List[float]) -> Measurement:
+    """Сводит сырые времена одного вызова в Measurement."""
+    if len(times) > 1:
+        q1, _, q3 = statistics.quantiles(times, n=4)
+    else:
+        q1 = q3 = times[0]
+    ci_low, ci_high = median_ci(times)
+    return Measurement(name, param, number, list(times), statistics.median(times),
+                       q3 - q1, ci_low, ci_high)
+
+
+def measure(func: Callable[[], object], name: str = "", param=None,
+            repeat: int = 7, number: Optional[int] = None, warmup: int = 1,
+            disable_gc: bool = True, min_time: float = 0.2) -> Measurement:
+    """
+    Замеряет func без аргументов и возвращает время одного вызова (сек).
+
+    Аргументы:
+        repeat: число серий
+        number: вызовов в серии; None - подобрать через calibrate
+        warmup: число прогревочных серий, не попадающих в результат
+        disable_gc: отключать сборщик мусора на время серии
+        min_time: целевая длительность серии при автоподборе
+    """
+    # timeit сам отключает gc; чтобы оставить его включенным, включаем в setup
+    timer = timeit.Timer(func, setup="pass" if disable_gc else gc.enable)
+    if number is None:
+        number = calibrate(func, min_time)
+    for _ in range(warmup):
+        timer.timeit(number)
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return summarize(name or getattr(func, "__name__", ""), param, number, times)
+
+
+def sweep(func: Callable, params: Iterable, name: str = "", **kwargs) -> List[Measurement]:
+    """Замеряет func(param) для каждого значения param."""
+    name = name or func.__name__
+    return [measure(lambda p=p: func(p), name=name, param=p, **kwargs) for p in params]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                             text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def save_results(measurements: Iterable[tuple], path: str,
+                 meta: Optional[Dict] = None) -> None:
+    """Сохраняет результаты в JSON вместе с коммитом и окружением."""
+    data = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **(meta or {}),
+        },
+        "results": [m._asdict() for m in measurements],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> List[tuple]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [
+        MemoryMeasurement(**item) if "peak_bytes" in item else Measurement(**item)
+        for item in data["results"]
+    ]
+
+
+def find_regressions(baseline: Iterable[Measurement], current: Iterable[Measurement],
+                     threshold: float = 0.1) -> List[tuple]:
+    """
+    Ищет замедления: медиана выросла больше чем на threshold, а доверительные
+    интервалы не пересекаются. Возвращает [(name, param, старая, новая, отношение)].
+    """
+    old = {(m.name, json.dumps(m.param)): m for m in baseline}
+    regressions = []
+    for m in current:
+        prev = old.get((m.name, json.dumps(m.param)))
+        if prev is None:
+            continue
+        ratio = m.median / prev.median if prev.median else math.inf
+        if ratio > 1 + threshold and m.ci_low > prev.ci_high:
+            regressions.append((m.name, m.param, prev.median, m.median, ratio))
+    return regressions
+
+
+def format_table(measurements: Iterable[Measurement]) -> str:
+    lines = [f"{'Функция':<24} | {'Параметр':>10} | {'Медиана, с':>12} | {'IQR, с':>10} | 95% ДИ"]
+    for m in measurements:
+        lines.append(f"{m.name:<24} | {str(m.param):>10} | {m.median:12.3e} | "
+                     f"{m.iqr:10.2e} | [{m.ci_low:.3e}, {m.ci_high:.3e}]")
+    return "\n".join(lines)
+
+
+def measure_memory(func: Callable[[], object], name: str = "", param=None,
+                   items: int = 1) -> MemoryMeasurement:
+    """
+    Замеряет память func через tracemalloc: пиковый объем во время вызова
+    и объем, который занимает возвращенный результат (пока он жив).
+    items - число элементов результата (узлов дерева) для расчета байт на элемент.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return MemoryMeasurement(name or getattr(func, "__name__", ""), param, items,
+                             peak, retained, retained / items if items else 0.0)
+
+
+def format_memory_table(measurements: Iterable[MemoryMeasurement]) -> str:
+    lines = [f"{'Функция':<28} | {'Параметр':>8} | {'Элементов':>10} | "
+             f"{'Пик, байт':>12} | {'Итог, байт':>12} | Байт/элемент"]
+    for m in measurements:
+        lines.append(f"{m.name:<28} | {str(m.param):>8} | {m.items:10} | "
+                     f"{m.peak_bytes:12} | {m.retained_bytes:12} | {m.bytes_per_item:.1f}")
+    return "\n".join(lines)
+
+
+def _pyplot(path: Optional[str]):
+    """Ленивый импорт matplotlib; для записи в файл - Agg без дисплея."""
+    import matplotlib
+    if path:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _finish_plot(plt, fig, path: Optional[str]) -> None:
+    if path:
+        fig.savefig(path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+def plot_memory(measurements: Iterable[MemoryMeasurement], path: Optional[str] = None,
+                title: str = "", xlabel: str = "n") -> None:
+    """Кривые байт на элемент по каждой функции."""
+    plt = _pyplot(path)
+    series: Dict[str, List[MemoryMeasurement]] = {}
+    for m in measurements:
+        series.setdefault(m.name, []).append(m)
+    fig, ax = plt.subplots()
+    for name, items in series.items():
+        ax.plot([m.param for m in items], [m.bytes_per_item for m in items], "o-", label=name)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Байт на элемент")
+    ax.set_title(title)
+    ax.legend()
+    _finish_plot(plt, fig, path)
+
+
+def plot(measurements: Iterable[Measurement], path: Optional[str] = None,
+         title: str = "", xlabel: str = "n") -> None:
+    """
+    Строит график медиан с ДИ по каждой функции. matplotlib импортируется
+    здесь; при заданном path рисуем в файл через Agg без дисплея.
+    """
+    plt = _pyplot(path)
+    series: Dict[str, List[Measurement]] = {}
+    for m in measurements:
+        series.setdefault(m.name, []).append(m)
+    fig, ax = plt.subplots()
+    for name, items in series.items():
+        xs = [m.param for m in items]
+        ax.plot(xs, [m.median for m in items], "o-", label=name)
+        ax.fill_between(xs, [m.ci_low for m in items], [m.ci_high for m in items], alpha=0.2)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Время вызова (сек)")
+    ax.set_title(title)
+    ax.legend()
+    _finish_plot(plt, fig, path)
+
+
+def save_csv(measurements: Iterable[tuple], path: str) -> None:
+    """Пишет CSV для Measurement или MemoryMeasurement (сырые времена не пишутся)."""
+    fields = [field for field in measurements[0]._fields if field != "times"] if measurements else []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for m in measurements:
+            writer.writerow([getattr(m, field) for field in fields])
+
+
+# Наборы замеров (suites): какие функции и из каких лабораторных работ
+ROOT = os.path.dirname(os.path.abspath(__file__))
+_modules: Dict[str, object] = {}
+
+
+def load_lab(relpath: str):
+    """Загружает lab.py по пути: у всех лабораторных одинаковое имя модуля."""
+    if relpath not in _modules:
+        name = relpath.replace("/", "_").replace(".py", "")
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relpath))
+        module = importlib.util.module_from_spec(spec)
+        # регистрируем модуль, чтобы его функции сериализовались pickle (пулы процессов)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        _modules[relpath] = module
+    return _modules[relpath]
+
+
+def _discover(relpath: str, prefixes: Tuple[str, ...], skip: Tuple[str, ...] = ()) -> Dict[str, Callable]:
+    """Находит в модуле функции, имена которых начинаются с prefixes."""
+    module = load_lab(relpath)
+    lab_name = os.path.dirname(relpath) or "lab"
+    return {
+        f"{lab_name}.{name}": getattr(module, name)
+        for name in sorted(vars(module))
+        if name.startswith(prefixes) and name not in skip and callable(getattr(module, name))
+    }
+
+
+def _factorial_suite() -> Dict[str, Callable]:
+    # fact_parallel поднимает пул процессов, его меряет laba4 отдельно
+    return _discover("laba4/lab.py", ("fact_",), skip=("fact_parallel",))
+
+
+def _tree_suite() -> Dict[str, Callable]:
+    funcs = {}
+    funcs.update(_discover("laba3/lab.py", ("gen_bin_tree",)))
+    # ленивое дерево ничего не строит заранее, сравнивать его с остальными бессмысленно
+    funcs.update(_discover("laba5/lab.py", ("gen_bin_tree",), skip=("gen_bin_tree_lazy",)))
+    funcs.update(_discover("labal6/lab.py", ("build_tree_",), skip=("build_tree_parallel",)))
+    return {name: (lambda h, f=f: f(h, 4)) for name, f in funcs.items()}
+
+
+def _sum_of_two_suite() -> Dict[str, Callable]:
+    module = load_lab("lab.py")
+    def make(method):
+        def run(n):
+            # худший случай: пары нет, все элементы просматриваются
+            nums = _cached_input(("sum_of_two", n), lambda: random.Random(n).sample(range(10 * n), n))
+            return module.sum_of_two(nums, -1, method=method)
+        return run
+    return {f"lab.sum_of_two[{method}]": make(method) for method in ("brute", "hash")}
+
+
+def _guess_number_suite() -> Dict[str, Callable]:
+    module = load_lab("laba2/lab.py")
+    def make(strategy):
+        def run(n):
+            numbers = _cached_input(("guess_number", n), lambda: list(range(1, n + 1)))
+            return module.guess_number(n - 1, numbers, strategy)
+        return run
+    return {f"laba2.guess_number[{s}]": make(s) for s in module.STRATEGIES}
+
+
+_inputs: Dict[tuple, object] = {}
+
+
+def _cached_input(key: tuple, build: Callable[[], object]):
+    """Входные данные строятся один раз и не попадают в замер."""
+    if key not in _inputs:
+        _inputs[key] = build()
+    return _inputs[key]
+
+
+SUITES: Dict[str, Tuple[Callable[[], Dict[str, Callable]], List[int], str]] = {
+    "factorial": (_factorial_suite, [100, 200, 400, 800], "n"),
+    "tree": (_tree_suite, [4, 8, 12], "Высота дерева"),
+    "sum_of_two": (_sum_of_two_suite, [100, 300, 1000], "len(nums)"),
+    "guess_number": (_guess_number_suite, [1000, 10000, 100000], "len(numbers)"),
+}
+
+# Число элементов результата для замера памяти: для деревьев - узлы
+ITEM_COUNTS: Dict[str, Callable[[int], int]] = {
+    "tree": lambda height: 2 ** height - 1,
+}
+
+
+def run_suite(suite: str, sizes: Optional[List[int]] = None, only: Optional[str] = None,
+              **kwargs) -> List[Measurement]:
+    """Прогоняет все функции набора по всем размерам."""
+    factory, default_sizes, _ = SUITES[suite]
+    results = []
+    for name, func in factory().items():
+        if only and only not in name:
+            continue
+        for size in sizes or default_sizes:
+            # входные данные готовим до замера
+            func(size)
+            results.append(measure(lambda f=func, s=size: f(s), name=name, param=size, **kwargs))
+    return results
+
+
+def run_memory(suite: str, sizes: Optional[List[int]] = None,
+               only: Optional[str] = None) -> List[MemoryMeasurement]:
+    """Замер пиковой и удерживаемой памяти для всех функций набора."""
+    factory, default_sizes, _ = SUITES[suite]
+    count = ITEM_COUNTS.get(suite, lambda size: size)
+    results = []
+    for name, func in factory().items():
+        if only and only not in name:
+            continue
+        for size in sizes or default_sizes:
+            results.append(measure_memory(lambda f=func, s=size: f(s), name=name,
+                                          param=size, items=count(size)))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности лабораторных работ")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="показать наборы и найденные функции")
+    run = commands.add_parser("run", help="выполнить наборы замеров")
+    run.add_argument("suites", nargs="+", choices=sorted(SUITES))
+    run.add_argument("--sizes", nargs="+", type=int, help="размеры входа вместо стандартных")
+    run.add_argument("--only", help="замерять только функции, в имени которых есть подстрока")
+    run.add_argument("--repeat", type=int, default=7)
+    run.add_argument("--min-time", type=float, default=0.2)
+    run.add_argument("--keep-gc", action="store_true", help="не отключать сборщик мусора")
+    run.add_argument("--json", help="сохранить результаты в JSON")
+    run.add_argument("--csv", help="сохранить результаты в CSV")
+    run.add_argument("--plot", help="сохранить график в файл (PNG/SVG)")
+    run.add_argument("--baseline", help="JSON прошлого запуска для поиска регрессий")
+    memory = commands.add_parser("memory", help="замерить пиковую память (tracemalloc)")
+    memory.add_argument("suites", nargs="+", choices=sorted(SUITES))
+    memory.add_argument("--sizes", nargs="+", type=int, help="размеры входа вместо стандартных")
+    memory.add_argument("--only", help="замерять только функции, в имени которых есть подстрока")
+    memory.add_argument("--json", help="сохранить результаты в JSON")
+    memory.add_argument("--csv", help="сохранить результаты в CSV")
+    memory.add_argument("--plot", help="сохранить кривую байт на элемент в файл")
+    compare = commands.add_parser("compare", help="сравнить два JSON с результатами")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for suite, (factory, sizes, _) in SUITES.items():
+            print(f"{suite} (размеры по умолчанию: {sizes})")
+            for name in factory():
+                print(f"  {name}")
+        return 0
+
+    if args.command == "compare":
+        baseline, current = load_results(args.baseline), load_results(args.current)
+        return _report_regressions(find_regressions(baseline, current, args.threshold))
+
+    if args.command == "memory":
+        measurements = []
+        for suite in args.suites:
+            results = run_memory(suite, args.sizes, args.only)
+            measurements += results
+            print(format_memory_table(results))
+            if args.plot:
+                root, ext = os.path.splitext(args.plot)
+                path = args.plot if len(args.suites) == 1 else f"{root}_{suite}{ext}"
+                plot_memory(results, path, title=f"{suite}: память", xlabel=SUITES[suite][2])
+        if args.json:
+            save_results(measurements, args.json, {"suites": args.suites, "kind": "memory"})
+        if args.csv:
+            save_csv(measurements, args.csv)
+        return 0
+
+    measurements = []
+    for suite in args.suites:
+        results = run_suite(suite, args.sizes, args.only, repeat=args.repeat,
+                            min_time=args.min_time, disable_gc=not args.keep_gc)
+        measurements += results
+        print(format_table(results))
+        if args.plot:
+            root, ext = os.path.splitext(args.plot)
+            path = args.plot if len(args.suites) == 1 else f"{root}_{suite}{ext}"
+            plot(results, path, title=suite, xlabel=SUITES[suite][2])
+    if args.json:
+        save_results(measurements, args.json, {"suites": args.suites})
+    if args.csv:
+        save_csv(measurements, args.csv)
+    if args.baseline:
+        return _report_regressions(find_regressions(load_results(args.baseline), measurements))
+    return 0
+
+
+def _report_regressions(regressions: List[tuple]) -> int:
+    for name, param, old, new, ratio in regressions:
+        print(f"Регрессия: {name}({param}) {old:.3e} -> {new:.3e} с (x{ratio:.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    # лабораторные загружают bench по имени - отдаем им этот же модуль, а не вторую копию
+    sys.modules.setdefault("bench", sys.modules[__name__])
+    sys.exit(main())
@@ -1,4 +1,18 @@
-def sum_of_two(nums: list, target: int) -> list:
+import array
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для векторизованного режима
+    np = None
+
+
+def sum_of_two_brute(nums: list, target: int) -> list:
     step = 0
     result = []
     for i in range(len(nums)):
@@ -10,6 +24,382 @@ def sum_of_two(nums: list, target: int) -> list:
         if step == 1:
             break
     return result 
+
+
+class SumOfTwoIndex:
+    """
+    Хеш-индекс по массиву nums для многократных запросов sum_of_two.
+
+    Для каждого значения хранятся два первых индекса, этого достаточно,
+    чтобы найти ту же пару [i, j], что и полный перебор.
+    """
+
+    def __init__(self, nums: list):
+        self.nums = nums
+        self.first = {}
+        self.second = {}
+        for i, num in enumerate(nums):
+            if num not in self.first:
+                self.first[num] = i
+            elif num not in self.second:
+                self.second[num] = i
+
+    def query(self, target: int) -> list:
+        first = self.first
+        second = self.second
+        for i, num in enumerate(self.nums):
+            j = first.get(target - num)
+            if j is None:
+                continue
+            if j == i:
+                # нужен другой элемент с тем же значением
+                j = second.get(num)
+                if j is None:
+                    continue
+            return [i, j]
+        return []
+
+    def query_many(self, targets) -> list:
+        return [self.query(target) for target in targets]
+
+
+def _as_numpy(nums):
+    if isinstance(nums, array.array):
+        return np.frombuffer(nums, dtype=nums.typecode)
+    return np.asarray(nums)
+
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _widen(data):
+    """
+    Приводит целые к int64, вещественные к float64: в узком или беззнаковом
+    типе target - nums переполняется и дает несуществующие пары.
+    uint64 со значениями выше int64 остается как есть (см. _fits_int64).
+    """
+    if data.dtype.kind in "biu":
+        if data.dtype == np.uint64 and len(data) and data.max() > _INT64_MAX:
+            return data
+        return data.astype(np.int64, copy=False)
+    if data.dtype.kind == "f":
+        return data.astype(np.float64, copy=False)
+    return data
+
+
+def _fits_int64(data, target, lo=None, hi=None) -> bool:
+    """
+    Можно ли считать target - data векторно: numpy молча переполняет int64,
+    поэтому target и все дополнения target - max .. target - min должны
+    оставаться в границах int64. Иначе нужен хеш-индекс на int Python.
+    """
+    if not len(data) or data.dtype.kind == "f" or isinstance(target, (float, np.floating)):
+        return True
+    if data.dtype != np.int64:
+        return False
+    target = int(target)
+    lo = int(data.min()) if lo is None else lo
+    hi = int(data.max()) if hi is None else hi
+    return (_INT64_MIN <= target <= _INT64_MAX
+            and _INT64_MIN <= target - hi and target - lo <= _INT64_MAX)
+
+
+class NumpySumOfTwoIndex:
+    """
+    Векторизованный индекс: один стабильный argsort и searchsorted по
+    дополнениям target - nums. Стабильная сортировка гарантирует, что среди
+    равных значений первым стоит наименьший исходный индекс, поэтому
+    результат совпадает с полным перебором.
+    """
+
+    def __init__(self, nums):
+        self.nums = _widen(_as_numpy(nums))
+        self.order = np.argsort(self.nums, kind="stable")
+        self.sorted = self.nums[self.order]
+        self.lo = int(self.sorted[0]) if len(self.sorted) and self.nums.dtype == np.int64 else None
+        self.hi = int(self.sorted[-1]) if self.lo is not None else None
+
+    def _partners(self, comps):
+        # comps: (..., n) -> индексы партнеров, -1 если партнера нет
+        n = len(self.nums)
+        own = np.arange(n)
+        pos = np.searchsorted(self.sorted, comps, side="left")
+        pos0 = np.minimum(pos, n - 1)
+        partner = np.where(self.sorted[pos0] == comps, self.order[pos0], -1)
+        # если найден сам элемент, берем следующий с тем же значением
+        pos1 = np.minimum(pos + 1, n - 1)
+        second = np.where(
+            (pos + 1 < n) & (self.sorted[pos1] == comps), self.order[pos1], -1
+        )
+        return np.where(partner == own, second, partner)
+
+    def _fits(self, target) -> bool:
+        return _fits_int64(self.nums, target, self.lo, self.hi)
+
+    def query(self, target) -> list:
+        if len(self.nums) < 2:
+            return []
+        if not self._fits(target):
+            return SumOfTwoIndex(self.nums.tolist()).query(target)
+        partners = self._partners(target - self.nums)
+        hits = np.flatnonzero(partners >= 0)
+        if not len(hits):
+            return []
+        i = hits[0]
+        return [int(i), int(partners[i])]
+
+    def query_many(self, targets, block_size: int = 1 << 22) -> list:
+        targets = list(targets)
+        n = len(self.nums)
+        if n < 2:
+            return [[] for _ in range(len(targets))]
+        if not all(self._fits(t) for t in targets):
+            return [self.query(t) for t in targets]
+        targets = np.asarray(targets)
+        result = []
+        # обрабатываем цели блоками, чтобы матрица (цели x n) не росла без предела
+        step = max(1, block_size // n)
+        for start in range(0, len(targets), step):
+            block = targets[start:start + step]
+            partners = self._partners(block[:, None] - self.nums[None, :])
+            found = partners >= 0
+            first = np.argmax(found, axis=1)
+            rows = np.arange(len(block))
+            for has, i, j in zip(found[rows, first], first, partners[rows, first]):
+                result.append([int(i), int(j)] if has else [])
+        return result
+
+
+def _is_buffer(nums) -> bool:
+    return np is not None and isinstance(nums, (np.ndarray, array.array))
+
+
+def _partition_worker(shm_name: str, n: int, target: int, start: int,
+                      stop: int):
+    """
+    Ищет первую пару внутри одного раздела общего буфера.
+
+    Буфер подготовлен родителем: первые n чисел - значения, упорядоченные
+    по разделам, следующие n - их исходные индексы (внутри раздела по
+    возрастанию). Процесс читает только свой срез [start, stop).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        shared = np.ndarray((2, n), dtype=np.int64, buffer=shm.buf)
+        pair = NumpySumOfTwoIndex(shared[0, start:stop]).query(target)
+        result = None
+        if pair:
+            result = [int(shared[1, start + pair[0]]), int(shared[1, start + pair[1]])]
+        del shared
+        return result
+    finally:
+        shm.close()
+
+
+def sum_of_two_parallel(nums, target: int, workers: int = None) -> list:
+    """
+    Многопроцессный режим: значения делятся на хеш-разделы, каждый процесс
+    решает свой раздел над общим буфером shared_memory, из найденных пар
+    берется лексикографически наименьшая. Только для целых чисел.
+
+    Раздел значения v определяется по min(v, target - v), поэтому v и его
+    дополнение всегда попадают в один раздел. Ключи и перестановка по
+    разделам считаются один раз в родителе, процессы получают только
+    границы своего среза, так что общая работа остается O(n), а не P*n.
+    """
+    if np is None:
+        raise ImportError("для режима parallel нужен numpy")
+    data = _as_numpy(nums)
+    if len(data) and data.dtype.kind not in "biu":
+        raise TypeError(f"режим parallel работает только с целыми числами, получен {data.dtype}")
+    data = _widen(data)
+    n = len(data)
+    workers = workers or os.cpu_count() or 1
+    # сортированный индекс строится только здесь: в параллельной ветке
+    # родитель не решает задачу сам, а лишь раскладывает значения по разделам
+    if workers == 1 or n < 2 or not _fits_int64(data, target):
+        return NumpySumOfTwoIndex(data).query(target)
+    parts = np.minimum(data, target - data) % workers
+    order = np.argsort(parts, kind="stable")
+    bounds = np.searchsorted(parts[order], np.arange(workers + 1))
+    shm = shared_memory.SharedMemory(create=True, size=2 * data.nbytes)
+    try:
+        shared = np.ndarray((2, n), dtype=np.int64, buffer=shm.buf)
+        shared[0] = data[order]
+        shared[1] = order
+        del shared
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_partition_worker, shm.name, n, target, int(lo), int(hi))
+                for lo, hi in zip(bounds[:-1], bounds[1:]) if hi - lo >= 2
+            ]
+            pairs = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    pairs = [pair for pair in pairs if pair]
+    return min(pairs) if pairs else []
+
+
+def parallel_speedup(nums, target: int, worker_counts) -> list:
+    """Замеряет sum_of_two_parallel для разного числа процессов: [(workers, сек, ускорение)]."""
+    curve = []
+    base = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        sum_of_two_parallel(nums, target, workers)
+        elapsed = time.perf_counter() - start
+        if base is None:
+            base = elapsed
+        curve.append((workers, elapsed, base / elapsed))
+    return curve
+
+
+def sum_of_two(nums: list, target: int, method: str = "auto",
+               workers: int = None) -> list:
+    if method == "auto":
+        method = "numpy" if _is_buffer(nums) else "hash"
+    if method == "parallel":
+        return sum_of_two_parallel(nums, target, workers)
+    if method == "numpy":
+        return NumpySumOfTwoIndex(nums).query(target)
+    if method == "hash":
+        return SumOfTwoIndex(nums).query(target)
+    if method == "brute":
+        return sum_of_two_brute(nums, target)
+    raise ValueError(f"Unknown method: {method}")
+
+
+def sum_of_two_many(nums: list, targets) -> list:
+    if _is_buffer(nums):
+        return NumpySumOfTwoIndex(nums).query_many(targets)
+    return SumOfTwoIndex(nums).query_many(targets)
+
+
+StreamResult = namedtuple("StreamResult", ["pair", "scanned", "table_bytes"])
+
+
+class ComplementTable:
+    """
+    Компактная хеш-таблица с открытой адресацией поверх array.array:
+    значение (int64) -> индекс первого вхождения. Занимает 16 байт на слот
+    вместо сотен байт на запись dict.
+    """
+
+    EMPTY = -1
+    # мультипликативное хеширование Фибоначчи: берем старшие биты произведения,
+    # младшие у ключей с общим шагом (кратных 2**k) совпадают
+    _MULTIPLIER = 0x9E3779B97F4A7C15
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity: int = 1024):
+        size = 1
+        while size < capacity * 2:
+            size <<= 1
+        self._alloc(size)
+
+    def _alloc(self, size: int):
+        self.mask = size - 1
+        self.shift = 64 - (size.bit_length() - 1)
+        self.keys = array.array("q", bytes(8 * size))
+        self.vals = array.array("q", [self.EMPTY]) * size
+        self.count = 0
+
+    def _slot(self, key: int) -> int:
+        mask = self.mask
+        keys = self.keys
+        vals = self.vals
+        i = ((key * self._MULTIPLIER) & self._MASK64) >> self.shift
+        while vals[i] != self.EMPTY and keys[i] != key:
+            i = (i + 1) & mask
+        return i
+
+    def get(self, key: int) -> int:
+        i = self._slot(key)
+        return self.vals[i]
+
+    def add(self, key: int, value: int):
+        """Запоминает только первое вхождение key."""
+        i = self._slot(key)
+        if self.vals[i] != self.EMPTY:
+            return
+        self.keys[i] = key
+        self.vals[i] = value
+        self.count += 1
+        if self.count * 2 > self.mask + 1:
+            self._grow()
+
+    def _grow(self):
+        keys, vals = self.keys, self.vals
+        self._alloc((self.mask + 1) * 2)
+        for key, value in zip(keys, vals):
+            if value != self.EMPTY:
+                self.add(key, value)
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.keys) + len(self.vals)) * 8
+
+
+def iter_chunks(source, chunk_size: int = 65536, typecode: str = "q"):
+    """
+    Отдает source порциями по chunk_size элементов.
+
+    source может быть путем к бинарному файлу с числами typecode,
+    numpy-массивом (в т.ч. np.memmap) или любым итерируемым объектом.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        itemsize = array.array(typecode).itemsize
+        with open(source, "rb") as f:
+            while True:
+                data = f.read(chunk_size * itemsize)
+                if not data:
+                    return
+                yield array.array(typecode, data)
+    elif np is not None and isinstance(source, np.ndarray):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    else:
+        it = iter(source)
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def sum_of_two_stream(source, target: int, chunk_size: int = 65536,
+                      typecode: str = "q") -> StreamResult:
+    """
+    Однопроходный поиск пары по потоку целых чисел без произвольного доступа.
+
+    Останавливается на первом j, для которого дополнение уже встречалось,
+    и возвращает [i, j] с наименьшим j. Это может отличаться от
+    sum_of_two, которой для выбора наименьшего i нужен весь массив.
+
+    table_bytes - размер таблицы дополнений в конце прохода (она только
+    растет). Буфер текущей порции в него не входит: его размер зависит от
+    источника (список, array, срез memmap без копии). Реальный пик памяти
+    замеряется снаружи, например bench.measure_memory.
+    Нецелые числа и целые вне диапазона int64 вызывают ValueError:
+    таблица хранит int64.
+    """
+    table = ComplementTable()
+    scanned = 0
+    for chunk in iter_chunks(source, chunk_size, typecode):
+        for num in chunk:
+            key = int(num)
+            if key != num:
+                raise ValueError(f"sum_of_two_stream принимает только целые числа, получено {num!r}")
+            if not -(1 << 63) <= key < (1 << 63):
+                raise ValueError(f"sum_of_two_stream: число {key} не помещается в int64")
+            i = table.get(target - key)
+            if i != table.EMPTY:
+                scanned += 1
+                return StreamResult([i, scanned - 1], scanned, table.nbytes)
+            table.add(key, scanned)
+            scanned += 1
+    return StreamResult([], scanned, table.nbytes)
 #print(sum_of_two([2, 7, 11, 15], 9)) 
 #print(sum_of_two([3, 2, 4], 6))
 #print(sum_of_two([3, 3], 6))
@@ -1,8 +1,138 @@
-﻿import unittest
-from typing import List, Tuple
+﻿import array
+import bisect
+import mmap
+import os
+import tempfile
+import unittest
+from collections import namedtuple
+from collections.abc import Sequence as SequenceABC
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для векторизованного пакетного поиска
+    np = None
+
+
+# Ленивые последовательности: числа не материализуются в список целиком
+class SortedIntFile(SequenceABC):
+    """
+    Отсортированный бинарный файл целых чисел, отображенный в память.
+
+    Длина и доступ по индексу за O(1), проверка вхождения за O(log n).
+    """
+
+    def __init__(self, path, typecode: str = "q"):
+        self.path = path
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap).cast(typecode)
+        else:
+            self._mmap = None
+            self._view = memoryview(array.array(typecode))
+
+    @staticmethod
+    def write(path, numbers: Iterable[int], typecode: str = "q") -> None:
+        """Записывает отсортированные числа в файл порциями."""
+        with open(path, "wb") as f:
+            chunk = array.array(typecode)
+            for num in numbers:
+                chunk.append(num)
+                if len(chunk) >= 65536:
+                    chunk.tofile(f)
+                    chunk = array.array(typecode)
+            chunk.tofile(f)
+
+    @property
+    def buffer(self) -> memoryview:
+        return self._view
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, index):
+        return self._view[index]
+
+    def __contains__(self, value) -> bool:
+        i = bisect.bisect_left(self, value)
+        return i < len(self) and self[i] == value
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LazyIterable(SequenceABC):
+    """
+    Обертка над генератором отсортированных чисел: элементы вычисляются
+    по мере обращения и кешируются. len() дочитывает генератор до конца.
+    """
+
+    def __init__(self, iterable: Iterable[int]):
+        self._iterator: Iterator[int] = iter(iterable)
+        self._cache: List[int] = []
+        self._exhausted = False
+
+    def _fill(self, size: int) -> None:
+        while not self._exhausted and len(self._cache) < size:
+            try:
+                self._cache.append(next(self._iterator))
+            except StopIteration:
+                self._exhausted = True
+
+    def __len__(self) -> int:
+        self._fill(float("inf"))
+        return len(self._cache)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            self._fill(float("inf"))
+        else:
+            self._fill(index + 1)
+        return self._cache[index]
+
+    def __iter__(self):
+        i = 0
+        while True:
+            self._fill(i + 1)
+            if i >= len(self._cache):
+                return
+            yield self._cache[i]
+            i += 1
+
+    def __contains__(self, value) -> bool:
+        # последовательность отсортирована: останавливаемся, как только перешли value
+        for num in self:
+            if num >= value:
+                return num == value
+        return False
+
+
+def as_sequence(numbers) -> Sequence[int]:
+    """Приводит вход к последовательности с len и доступом по индексу без копирования."""
+    if isinstance(numbers, (range, list, tuple, SortedIntFile, LazyIterable)):
+        return numbers
+    if isinstance(numbers, SequenceABC):
+        return numbers
+    return LazyIterable(numbers)
+
 
 # Функция медленного перебора (инкремента)
-def guess_number(target, numbers):
+def linear_search(target, numbers):
+    if isinstance(numbers, range):
+        # для range позицию считаем арифметически, список не строится
+        if target in numbers:
+            return target, numbers.index(target) + 1
+        return None, len(numbers)
     attempts = 0
     for num in numbers:
         attempts += 1
@@ -10,7 +140,181 @@ def guess_number(target, numbers):
             return target, attempts
     return None, attempts  # Возвращаем None, если число не найдено
 
-def helper() -> Tuple[int, List[int]]:    
+# Бинарный поиск по отсортированной последовательности
+def binary_search(target, numbers: Sequence[int]):
+    attempts = 0
+    low, high = 0, len(numbers) - 1
+    while low <= high:
+        attempts += 1
+        mid = (low + high) // 2
+        value = numbers[mid]
+        if value == target:
+            return target, attempts
+        if value < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return None, attempts
+
+# Интерполяционный поиск: позиция оценивается по значению
+def interpolation_search(target, numbers: Sequence[int]):
+    attempts = 0
+    low, high = 0, len(numbers) - 1
+    while low <= high and numbers[low] <= target <= numbers[high]:
+        attempts += 1
+        if numbers[high] == numbers[low]:
+            mid = low
+        else:
+            mid = low + (target - numbers[low]) * (high - low) // (numbers[high] - numbers[low])
+        value = numbers[mid]
+        if value == target:
+            return target, attempts
+        if value < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return None, attempts
+
+# Галопирующий (экспоненциальный) поиск: удваиваем шаг, затем бинарный поиск.
+# len() не вызывается, поэтому ленивый вход дочитывается только до границы.
+def galloping_search(target, numbers: Sequence[int]):
+    attempts = 0
+    bound = 1
+    while True:
+        attempts += 1
+        try:
+            value = numbers[bound - 1]
+        except IndexError:
+            break
+        if value >= target:
+            break
+        bound *= 2
+    low = bound // 2
+    high = bound - 1
+    while low <= high:
+        mid = (low + high) // 2
+        try:
+            value = numbers[mid]
+        except IndexError:
+            high = mid - 1
+            continue
+        attempts += 1
+        if value == target:
+            return target, attempts
+        if value < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return None, attempts
+
+STRATEGIES: Dict[str, Callable] = {
+    "linear": linear_search,
+    "binary": binary_search,
+    "interpolation": interpolation_search,
+    "galloping": galloping_search,
+}
+
+def guess_number(target, numbers, strategy: str = "linear"):
+    """
+    Угадывает число target в numbers выбранной стратегией.
+
+    Все стратегии кроме linear требуют отсортированных чисел; вход
+    (генератор, SortedIntFile, range) приводится к последовательности
+    через as_sequence без построения списка. Возвращает (target, attempts)
+    или (None, attempts), если число не найдено.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия: {strategy}")
+    if strategy != "linear":
+        numbers = as_sequence(numbers)
+    return STRATEGIES[strategy](target, numbers)
+
+BatchResult = namedtuple("BatchResult", ["results", "attempts", "stats"])
+
+def attempt_stats(attempts: Sequence[int]) -> Dict[str, float]:
+    """Сводная статистика попыток: среднее, медиана и 99-й перцентиль."""
+    if not attempts:
+        return {"count": 0, "mean": 0.0, "p50": 0, "p99": 0}
+    ordered = sorted(attempts)
+    def percentile(q):
+        # метод ближайшего ранга
+        rank = max(1, -(-q * len(ordered) // 100))
+        return ordered[rank - 1]
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(50),
+        "p99": percentile(99),
+    }
+
+def _linear_batch(targets: Sequence[int], numbers) -> Tuple[list, list]:
+    """
+    Линейная стратегия для многих целей за один проход: попытки равны
+    позиции числа + 1, как у guess_number(strategy="linear").
+    """
+    results = [None] * len(targets)
+    attempts = [0] * len(targets)
+    if isinstance(numbers, range):
+        for k, target in enumerate(targets):
+            results[k], attempts[k] = linear_search(target, numbers)
+        return results, attempts
+    buffer = None
+    if np is not None:
+        if isinstance(numbers, np.ndarray):
+            buffer = numbers
+        elif isinstance(numbers, SortedIntFile):
+            buffer = np.asarray(numbers.buffer)
+        elif isinstance(numbers, (list, tuple)):
+            buffer = np.asarray(numbers)
+    if buffer is not None:
+        if len(buffer) == 0:
+            return results, attempts
+        # один векторизованный searchsorted по всем целям
+        wanted = np.asarray(targets)
+        pos = np.searchsorted(buffer, wanted)
+        found = (pos < len(buffer)) & (buffer[np.minimum(pos, len(buffer) - 1)] == wanted)
+        for k, (ok, p) in enumerate(zip(found.tolist(), pos.tolist())):
+            results[k] = targets[k] if ok else None
+            attempts[k] = p + 1 if ok else len(buffer)
+        return results, attempts
+    # слияние отсортированных целей с отсортированными числами
+    order = sorted(range(len(targets)), key=lambda k: targets[k])
+    it = iter(numbers)
+    position = 0
+    current = next(it, None)
+    for k in order:
+        target = targets[k]
+        while current is not None and current < target:
+            position += 1
+            current = next(it, None)
+        if current is not None and current == target:
+            results[k], attempts[k] = target, position + 1
+        else:
+            attempts[k] = None  # дозаполним длиной после прохода
+    for _ in it:
+        position += 1
+    total = position + (current is not None)
+    attempts = [total if a is None else a for a in attempts]
+    return results, attempts
+
+def guess_numbers(targets: Sequence[int], numbers, strategy: str = "linear") -> BatchResult:
+    """
+    Пакетное угадывание многих чисел в одной отсортированной последовательности.
+
+    Для linear все цели обрабатываются одним проходом (searchsorted или
+    слияние), для остальных стратегий каждая цель ищется за O(log n).
+    """
+    targets = list(targets)
+    if strategy == "linear":
+        results, attempts = _linear_batch(targets, numbers)
+    else:
+        numbers = as_sequence(numbers)
+        pairs = [guess_number(target, numbers, strategy) for target in targets]
+        results = [r for r, _ in pairs]
+        attempts = [a for _, a in pairs]
+    return BatchResult(results, attempts, attempt_stats(attempts))
+
+def helper() -> Tuple[int, range]:    
     # Вспомогательная функция для получения входных данных от пользователя.
     
     # Получаем диапазон
@@ -25,9 +329,9 @@ def helper() -> Tuple[int, List[int]]:
         except ValueError:
             print("Ошибка: введите целые числа!")
 
-    # Создаем список чисел
-    numbers = list(range(start, end + 1))
-    print(f"Создан список из {len(numbers)} чисел: от {start} до {end}")
+    # Диапазон не материализуется: len и проверка вхождения за O(1)
+    numbers = range(start, end + 1)
+    print(f"Создан диапазон из {len(numbers)} чисел: от {start} до {end}")
     
     # Получаем число для угадывания
     while True:
@@ -68,6 +372,79 @@ class TestMath(unittest.TestCase):
         self.assertIsNone(result)  # Проверяем, что результат None
         self.assertEqual(attempts, 10)  # Все 5 чисел были проверены
 
+    def test_strategies_agree(self):
+        """Все стратегии находят число и не находят отсутствующее"""
+        numbers = list(range(1, 101))
+        for strategy in STRATEGIES:
+            for target in (1, 37, 100):
+                result, attempts = guess_number(target, numbers, strategy)
+                self.assertEqual(result, target)
+                self.assertGreaterEqual(attempts, 1)
+            self.assertIsNone(guess_number(0, numbers, strategy)[0])
+            self.assertIsNone(guess_number(101, numbers, strategy)[0])
+
+    def test_binary_fewer_attempts(self):
+        """Бинарный поиск укладывается в log2(n) + 1 попыток"""
+        numbers = list(range(1, 1025))
+        _, linear_attempts = guess_number(1000, numbers)
+        _, binary_attempts = guess_number(1000, numbers, "binary")
+        self.assertEqual(linear_attempts, 1000)
+        self.assertLessEqual(binary_attempts, 11)
+
+    def test_huge_range(self):
+        """Диапазон из миллиардов чисел без построения списка"""
+        numbers = range(1, 5_000_000_001)
+        self.assertEqual(guess_number(4_999_999_999, numbers), (4_999_999_999, 4_999_999_999))
+        self.assertEqual(guess_number(123_456_789, numbers, "interpolation"), (123_456_789, 1))
+        self.assertEqual(guess_number(123_456_789, numbers, "galloping")[0], 123_456_789)
+
+    def test_sorted_int_file(self):
+        """Поиск по отсортированному файлу, отображенному в память"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "numbers.bin")
+            SortedIntFile.write(path, range(0, 200_000, 2))
+            with SortedIntFile(path) as numbers:
+                self.assertEqual(len(numbers), 100_000)
+                self.assertIn(1000, numbers)
+                self.assertNotIn(1001, numbers)
+                self.assertEqual(guess_number(1000, numbers, "binary")[0], 1000)
+                self.assertIsNone(guess_number(1001, numbers, "galloping")[0])
+
+    def test_batch_matches_single(self):
+        """Пакетный поиск дает те же результаты и попытки, что и поштучный"""
+        numbers = list(range(0, 200, 3))
+        targets = [9, 0, 198, 5, 300, 9, -1]
+        expected = [guess_number(t, numbers) for t in targets]
+        for source in (numbers, range(0, 200, 3), iter(numbers)):
+            batch = guess_numbers(targets, source)
+            self.assertEqual(list(zip(batch.results, batch.attempts)), expected)
+        for empty in ([], (), range(0), iter([])):
+            batch = guess_numbers([1, 2], empty)
+            self.assertEqual(list(zip(batch.results, batch.attempts)), [guess_number(1, [])] * 2)
+        batch = guess_numbers(targets, numbers, "binary")
+        self.assertEqual(batch.results, [t if t in numbers else None for t in targets])
+        self.assertEqual(batch.stats["count"], len(targets))
+
+    def test_attempt_stats(self):
+        """Статистика попыток"""
+        stats = attempt_stats(list(range(1, 101)))
+        self.assertEqual(stats["mean"], 50.5)
+        self.assertEqual(stats["p50"], 50)
+        self.assertEqual(stats["p99"], 99)
+
+    def test_generator_input(self):
+        """Генератор читается лениво: галопирующий поиск не дочитывает его"""
+        produced = []
+        def gen():
+            for i in range(1_000_000):
+                produced.append(i)
+                yield i
+        result, _ = guess_number(10, gen(), "galloping")
+        self.assertEqual(result, 10)
+        self.assertLess(len(produced), 100)
+        self.assertIn(5, LazyIterable(iter([1, 3, 5])))
+        self.assertNotIn(4, LazyIterable(iter([1, 3, 5])))
+
 # Запуск тестов
 if __name__ == '__main__':
     # helper() - для ручного тестирования
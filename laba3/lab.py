@@ -1,6 +1,15 @@
 ﻿# Построение бинарного дерева
+import array
+import io
+import sys
 import unittest
-from typing import List, Tuple
+from collections import deque
+from typing import Callable, Iterator, List, TextIO, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # без numpy уровни строятся скалярно
+    np = None
 
 #параметры по умолчанию
 par_height = 4
@@ -14,17 +23,200 @@ def left_branch(root:int) -> int:
 def right_branch(root:int) -> int:
     return root + 1
 
-def gen_bin_tree(height:int, root:int) -> dict:
+# функции, которые корректно работают с целыми numpy-массивами
+VECTORIZED_BRANCHES = {left_branch, right_branch}
+
+# выше этого порога считаем int64 ненадежным и переходим на object-массив
+_INT64_SAFE = 2 ** 62
+
+
+def _vector_children(level, branch):
+    """Применяет branch ко всему уровню, переходя на целые Python при переполнении."""
+    if level.dtype != object:
+        estimate = branch(level.astype(np.float64))
+        if np.all(np.abs(estimate) < _INT64_SAFE):
+            return branch(level)
+        level = level.astype(object)
+    return branch(level)
+
+
+def gen_tree_levels(height:int, root:int,
+                    left:Callable=left_branch,
+                    right:Callable=right_branch,
+                    vectorized:bool=None) -> Iterator:
+    """
+    Генерирует дерево по уровням: каждый уровень - массив значений в порядке кучи.
+
+    Аргументы:
+        height (int): высота дерева
+        root (int): значение корня
+        left, right (callable): правила вычисления потомков
+        vectorized (bool): применять правила сразу к numpy-массиву уровня;
+            по умолчанию - только для left_branch/right_branch и при наличии numpy
+
+    Возвращает:
+        Iterator: уровни дерева (numpy-массивы или списки)
+    """
+    if vectorized is None:
+        vectorized = left in VECTORIZED_BRANCHES and right in VECTORIZED_BRANCHES
+    vectorized = vectorized and np is not None
+    if height <= 0:
+        return
+    if vectorized:
+        try:
+            level = np.array([root], dtype=np.int64)
+        except OverflowError:
+            level = np.array([root], dtype=object)
+    else:
+        level = [root]
+    for depth in range(height):
+        yield level
+        if depth == height - 1:
+            break
+        if vectorized:
+            children = np.empty(2 * len(level), dtype=object if level.dtype == object else np.int64)
+            lefts = _vector_children(level, left)
+            rights = _vector_children(level, right)
+            if lefts.dtype == object or rights.dtype == object:
+                children = children.astype(object)
+            children[0::2] = lefts
+            children[1::2] = rights
+        else:
+            children = [0] * (2 * len(level))
+            children[0::2] = [left(x) for x in level]
+            children[1::2] = [right(x) for x in level]
+        level = children
+
+
+class FlatTree:
+    """
+    Полное бинарное дерево в виде плоского массива в порядке кучи.
+
+    Потомки узла i лежат по индексам 2*i + 1 и 2*i + 2. Значения хранятся
+    в numpy-массиве int64 или array.array('q') (8 байт на узел), а если не
+    помещаются в int64 - в object-массиве или обычном списке.
+    """
+
+    def __init__(self, values, height:int):
+        self.values = values
+        self.height = height
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @staticmethod
+    def left(index:int) -> int:
+        return 2 * index + 1
+
+    @staticmethod
+    def right(index:int) -> int:
+        return 2 * index + 2
+
+    def is_leaf(self, index:int) -> bool:
+        return 2 * index + 1 >= len(self.values)
+
+    def to_dict(self, index:int=0) -> dict:
+        """Строит словарное представление поддерева с корнем index (по требованию)."""
+        node = {"root": self.values[index]}
+        if not self.is_leaf(index):
+            node["left_leaf"] = self.to_dict(self.left(index))
+            node["right_leaf"] = self.to_dict(self.right(index))
+        return node
+
+
+def gen_bin_tree_flat(height:int, root:int, vectorized:bool=True) -> FlatTree:
+    """
+    Создает бинарное дерево в компактном виде (FlatTree).
+    
+    Аргументы:
+        height (int): высота дерева (сколько уровней)
+        root (int): значение корневого узла
+        vectorized (bool): строить уровни numpy-операциями (если numpy есть)
+    
+    Возвращает:
+        FlatTree: дерево в виде плоского массива
+    """
+    if vectorized and np is not None:
+        levels = list(gen_tree_levels(height, root, vectorized=True))
+        if not levels:
+            return FlatTree(np.empty(0, dtype=np.int64), 0)
+        dtype = object if any(level.dtype == object for level in levels) else np.int64
+        return FlatTree(np.concatenate(levels).astype(dtype, copy=False), height)
+    if height <= 0:
+        return FlatTree(array.array("q"), 0)
+    size = 2 ** height - 1
+    try:
+        values = _fill_heap(array.array("q", bytes(8 * size)), root)
+    except OverflowError:
+        # значения не помещаются в int64 - храним целые Python
+        values = _fill_heap([0] * size, root)
+    return FlatTree(values, height)
+
+
+def _fill_heap(values, root:int):
+    values[0] = root
+    # каждый внутренний узел задает значения двух потомков
+    for i in range(len(values) // 2):
+        values[2 * i + 1] = left_branch(values[i])
+        values[2 * i + 2] = right_branch(values[i])
+    return values
+
+
+def gen_bin_tree_shared(height:int, root:int) -> dict:
+    """
+    Создает дерево с общими поддеревьями (hash-consing).
+
+    Поддерево однозначно задается парой (значение, оставшаяся высота),
+    поэтому одинаковые поддеревья строятся один раз и переиспользуются:
+    результат - ориентированный ациклический граф из тех же словарей.
+    
+    Аргументы:
+        height (int): высота дерева (сколько уровней)
+        root (int): значение корневого узла
+    
+    Возвращает:
+        dict: корень дерева (словари поддеревьев могут быть общими)
+    """
+    if height <= 0:
+        return {}
+    # уникальные значения на каждом уровне
+    levels = [{root}]
+    for _ in range(height - 1):
+        levels.append({child for value in levels[-1]
+                       for child in (left_branch(value), right_branch(value))})
+    # строим снизу вверх: memo - поддеревья уровня ниже по значению
+    memo = {value: {"root": value} for value in levels[-1]}
+    for level in reversed(levels[:-1]):
+        memo = {
+            value: {
+                "root": value,
+                "left_leaf": memo[left_branch(value)],
+                "right_leaf": memo[right_branch(value)],
+            }
+            for value in level
+        }
+    return memo[root]
+
+
+def gen_bin_tree(height:int, root:int, layout:str="dict") -> Union[dict, FlatTree]:
     """
     Создает бинарное дерево рекурсивно и возвращает его в виде словаря.
     
     Аргументы:
         height (int): высота дерева (сколько уровней)
         root (int): значение корневого узла
+        layout (str): "dict" - вложенные словари, "flat" - FlatTree,
+            "shared" - словари с общими поддеревьями
     
     Возвращает:
-        dict: дерево в виде словаря
+        dict: дерево в виде словаря (или FlatTree при layout="flat")
     """
+    if layout == "flat":
+        return gen_bin_tree_flat(height, root)
+    if layout == "shared":
+        return gen_bin_tree_shared(height, root)
+    if layout != "dict":
+        raise ValueError(f"Неизвестный формат дерева: {layout}")
     # Базовый случай: если высота 1, возвращаем просто корень
     if height == 1:
         return {"root": root}
@@ -40,50 +232,136 @@ def gen_bin_tree(height:int, root:int) -> dict:
         "right_leaf": right_leaf
     }
 
-def print_tree(tree, level:int=0):
+# Обходы дерева без рекурсии (явный стек / очередь).
+# Узел - словарь для dict-дерева или индекс для FlatTree.
+def _tree_accessors(tree):
+    """Возвращает (корень, значение(узел), потомки(узел)) для dict или FlatTree."""
+    if isinstance(tree, FlatTree):
+        values = tree.values
+        size = len(values)
+        def children(index):
+            left = 2 * index + 1
+            return (left, left + 1) if left < size else ()
+        return (0 if size else None), values.__getitem__, children
+    def children(node):
+        return tuple(node[key] for key in ("left_leaf", "right_leaf") if node.get(key))
+    return (tree if tree and "root" in tree else None), (lambda node: node["root"]), children
+
+
+def iter_preorder(tree) -> Iterator[Tuple[int, int]]:
+    """Прямой обход: (значение, уровень) - узел, затем левое и правое поддеревья."""
+    root, value, children = _tree_accessors(tree)
+    if root is None:
+        return
+    stack = [(root, 0)]
+    while stack:
+        node, level = stack.pop()
+        yield value(node), level
+        for child in reversed(children(node)):
+            stack.append((child, level + 1))
+
+
+def iter_inorder(tree) -> Iterator[Tuple[int, int]]:
+    """Центрированный обход: левое поддерево, узел, правое поддерево."""
+    root, value, children = _tree_accessors(tree)
+    if root is None:
+        return
+    # (узел, уровень, развернут ли узел)
+    stack = [(root, 0, False)]
+    while stack:
+        node, level, expanded = stack.pop()
+        if expanded:
+            yield value(node), level
+            continue
+        kids = children(node)
+        if len(kids) == 2:
+            stack.append((kids[1], level + 1, False))
+        stack.append((node, level, True))
+        if kids:
+            # единственный потомок словарного дерева считается левым
+            stack.append((kids[0], level + 1, False))
+
+
+def iter_postorder(tree) -> Iterator[Tuple[int, int]]:
+    """Обратный обход: левое и правое поддеревья, затем узел."""
+    root, value, children = _tree_accessors(tree)
+    if root is None:
+        return
+    stack = [(root, 0, False)]
+    while stack:
+        node, level, expanded = stack.pop()
+        if expanded:
+            yield value(node), level
+            continue
+        stack.append((node, level, True))
+        for child in reversed(children(node)):
+            stack.append((child, level + 1, False))
+
+
+def iter_level_order(tree) -> Iterator[Tuple[int, int]]:
+    """Обход в ширину по уровням."""
+    root, value, children = _tree_accessors(tree)
+    if root is None:
+        return
+    queue = deque([(root, 0)])
+    while queue:
+        node, level = queue.popleft()
+        yield value(node), level
+        for child in children(node):
+            queue.append((child, level + 1))
+
+
+def print_tree(tree, level:int=0, stream:TextIO=None, chunk_lines:int=8192):
     """
     Красиво печатает дерево в консоли.
     
     Аргументы:
-        tree (dict): дерево для печати
-        level (int): текущий уровень (для отступов)
+        tree (dict | FlatTree): дерево для печати
+        level (int): начальный уровень (для отступов)
+        stream (TextIO): куда писать, по умолчанию sys.stdout
+        chunk_lines (int): сколько строк копить перед одной записью в поток
     """
-    if not tree:
-        return
-    
-    # Отступ в зависимости от уровня
-    indent = "  " * level
-    
-    # Печатаем текущий узел
-    print(f"{indent}├── {tree['root']}")
-    
-    # Рекурсивно печатаем левое и правое поддеревья
-    if "left_leaf" in tree:
-        print_tree(tree["left_leaf"], level + 1)
-    if "right_leaf" in tree:
-        print_tree(tree["right_leaf"], level + 1) 
- 
-def count_nodes(tree):
+    stream = sys.stdout if stream is None else stream
+    buffer = []
+    for value, depth in iter_preorder(tree):
+        buffer.append(f"{'  ' * (level + depth)}├── {value}\n")
+        if len(buffer) >= chunk_lines:
+            stream.write("".join(buffer))
+            buffer.clear()
+    if buffer:
+        stream.write("".join(buffer))
+
+def count_nodes(tree, unique:bool=False):
     """
     Считает количество узлов в дереве.
     
     Аргументы:
-        tree (dict): дерево для подсчета
+        tree (dict | FlatTree): дерево для подсчета (для FlatTree - за O(1))
+        unique (bool): считать различные объекты-узлы, а не логические узлы
+            (имеет смысл для дерева с общими поддеревьями)
     
     Возвращает:
         int: количество узлов
     """
+    if isinstance(tree, FlatTree):
+        return len(tree)
     if not tree or "root" not in tree:
         return 0
-    
-    # Считаем текущий узел + узлы в левом и правом поддеревьях
-    total = 1
-    if "left_leaf" in tree:
-        total += count_nodes(tree["left_leaf"])
-    if "right_leaf" in tree:
-        total += count_nodes(tree["right_leaf"])
-    
-    return total        
+    # каждый различный узел обрабатывается один раз, размеры общих
+    # поддеревьев берутся из memo, поэтому DAG считается за O(уникальных узлов)
+    memo = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in memo:
+            continue
+        kids = [node[key] for key in ("left_leaf", "right_leaf") if node.get(key)]
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((kid, False) for kid in kids if id(kid) not in memo)
+            continue
+        memo[id(node)] = 1 + sum(memo[id(kid)] for kid in kids)
+    return len(memo) if unique else memo[id(tree)]
 
 # Тесты
 class TestMath(unittest.TestCase):
@@ -177,6 +455,85 @@ class TestMath(unittest.TestCase):
         self.assertEqual(tree_large["left_leaf"]["root"], 4000)  # 1000 * 4
         self.assertEqual(tree_large["right_leaf"]["root"], 1001)  # 1000 + 1
 
+    def test_flat_tree(self):
+        """Плоское дерево совпадает со словарным"""
+        for height in range(1, 7):
+            flat = gen_bin_tree(height, 3, layout="flat")
+            self.assertEqual(flat.to_dict(), gen_bin_tree(height, 3))
+            self.assertEqual(count_nodes(flat), 2 ** height - 1)
+        self.assertIsInstance(gen_bin_tree_flat(4, 4, vectorized=False).values, array.array)
+        for vectorized in (False, True):
+            for height in (0, -1):
+                empty = gen_bin_tree_flat(height, 4, vectorized=vectorized)
+                self.assertEqual((len(empty.values), empty.height), (0, 0))
+
+    def test_flat_tree_big_values(self):
+        """Значения больше int64 хранятся без переполнения"""
+        for vectorized in (False, True):
+            flat = gen_bin_tree_flat(3, 2 ** 62, vectorized=vectorized)
+            self.assertEqual(flat.values[1], 2 ** 64)
+            self.assertEqual(count_nodes(flat), 7)
+
+    def test_levels_vectorized_and_scalar(self):
+        """Векторизованные уровни совпадают со скалярными"""
+        fast = [list(level) for level in gen_tree_levels(6, 4)]
+        slow = [list(level) for level in gen_tree_levels(6, 4, vectorized=False)]
+        self.assertEqual(fast, slow)
+        self.assertEqual(slow[1], [16, 5])
+        custom = list(gen_tree_levels(3, 1, left=lambda x: x * 2, right=lambda x: x * 3))
+        self.assertEqual(list(custom[2]), [4, 6, 6, 9])
+
+    def test_levels_overflow_to_objects(self):
+        """При переполнении int64 уровни переходят на целые Python"""
+        levels = list(gen_tree_levels(4, 2 ** 58))
+        self.assertEqual(levels[-1][0], 2 ** 64)
+        self.assertEqual(levels[-1][-1], 2 ** 58 + 3)
+
+    def test_traversal_orders(self):
+        """Порядок обходов на дереве высотой 3"""
+        for tree in (gen_bin_tree(3, 1), gen_bin_tree(3, 1, layout="flat")):
+            pre = [int(v) for v, _ in iter_preorder(tree)]
+            ino = [int(v) for v, _ in iter_inorder(tree)]
+            post = [int(v) for v, _ in iter_postorder(tree)]
+            lvl = [int(v) for v, _ in iter_level_order(tree)]
+            self.assertEqual(pre, [1, 4, 16, 5, 2, 8, 3])
+            self.assertEqual(ino, [16, 4, 5, 1, 8, 2, 3])
+            self.assertEqual(post, [16, 5, 4, 8, 3, 2, 1])
+            self.assertEqual(lvl, [1, 4, 2, 16, 5, 8, 3])
+
+    def test_deep_tree_without_recursion(self):
+        """Вырожденное дерево глубже лимита рекурсии"""
+        tree = {"root": 0}
+        node = tree
+        for i in range(1, 5000):
+            node["left_leaf"] = {"root": i}
+            node = node["left_leaf"]
+        self.assertEqual(count_nodes(tree), 5000)
+        stream = io.StringIO()
+        print_tree(tree, stream=stream, chunk_lines=100)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 5000)
+        self.assertEqual(lines[1], "  ├── 1")
+
+    def test_shared_tree(self):
+        """Дерево с общими поддеревьями совпадает с обычным"""
+        for root in (0, 1, 4):
+            shared = gen_bin_tree(6, root, layout="shared")
+            self.assertEqual(shared, gen_bin_tree(6, root))
+            self.assertEqual(count_nodes(shared), 63)
+            self.assertLessEqual(count_nodes(shared, unique=True), 63)
+        # при root = 0 левая ветвь дает 0 = root, поддеревья переиспользуются
+        shared = gen_bin_tree_shared(10, 0)
+        self.assertEqual(count_nodes(shared), 1023)
+        self.assertEqual(count_nodes(shared, unique=True), 832)
+        def walk(path):
+            node = shared
+            for step in path:
+                node = node["left_leaf" if step == "L" else "right_leaf"]
+            return node
+        # 0 -> 0 -> 0 -> 1 -> 4 и 0 -> 1 -> 2 -> 3 -> 4: один и тот же объект
+        self.assertIs(walk("LLRL"), walk("RRRR"))
+
 # Запуск тестов
 if __name__ == '__main__':
     print("Бинарное дерево (вариант 1)")
@@ -1,5 +1,11 @@
-﻿import timeit
-import matplotlib.pyplot as plt
+﻿import math
+import mmap
+import os
+import sys
+import tempfile
+import unittest
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import random
 
 #https://colab.research.google.com
@@ -19,32 +25,368 @@ def fact_iterative(n: int) -> int:
     return res
 
 
-def benchmark(func, data, number=1, repeat=5):
-    """Возвращает среднее время выполнения func на наборе data"""
+def _product(lo: int, hi: int) -> int:
+    """Произведение lo * (lo + 1) * ... * hi деревом (бинарное разбиение)"""
+    if lo > hi:
+        return 1
+    if hi - lo < 8:
+        res = lo
+        for i in range(lo + 1, hi + 1):
+            res *= i
+        return res
+    mid = (lo + hi) // 2
+    return _product(lo, mid) * _product(mid + 1, hi)
+
+
+def _product_list(items: list, lo: int = 0, hi: int = None) -> int:
+    """Произведение элементов списка сбалансированным деревом"""
+    if hi is None:
+        hi = len(items)
+    if hi - lo <= 8:
+        res = 1
+        for i in range(lo, hi):
+            res *= items[i]
+        return res
+    mid = (lo + hi) // 2
+    return _product_list(items, lo, mid) * _product_list(items, mid, hi)
+
+
+def fact_binary_split(n: int) -> int:
+    """Факториал бинарным разбиением: множители близкого размера перемножаются быстрее"""
+    if n < 2:
+        return 1
+    return _product(2, n)
+
+
+# Решето простых чисел, переиспользуется между вызовами
+_sieve_limit = 1
+_primes = []
+
+
+def _primes_up_to(n: int) -> list:
+    """Простые числа <= n из кеша; решето пересчитывается только при росте n"""
+    global _sieve_limit, _primes
+    if n > _sieve_limit:
+        limit = max(n, 2 * _sieve_limit)
+        sieve = bytearray([1]) * (limit + 1)
+        sieve[0:2] = b"\x00\x00"
+        for i in range(2, math.isqrt(limit) + 1):
+            if sieve[i]:
+                sieve[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+        _primes = [i for i in range(2, limit + 1) if sieve[i]]
+        _sieve_limit = limit
+    if n == _sieve_limit:
+        return _primes
+    # бинарный поиск границы, чтобы не копировать весь список
+    lo, hi = 0, len(_primes)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _primes[mid] <= n:
+            lo = mid + 1
+        else:
+            hi = mid
+    return _primes[:lo]
+
+
+def _swing(n: int, primes: list) -> int:
+    """Размах n≀ = n! / ((n // 2)!)^2 через разложение на простые"""
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        q = n
+        power = 1
+        while True:
+            q //= p
+            if q == 0:
+                break
+            if q & 1:
+                power *= p
+        if power > 1:
+            factors.append(power)
+    return _product_list(factors)
+
+
+def fact_prime_swing(n: int) -> int:
+    """Факториал алгоритмом prime swing: n! = ((n // 2)!)^2 * n≀"""
+    if n < 2:
+        return 1
+    primes = _primes_up_to(n)
+    return fact_prime_swing(n // 2) ** 2 * _swing(n, primes)
+
+
+def _range_product(bounds: tuple) -> int:
+    """Частичное произведение для процесса-исполнителя"""
+    return _product(*bounds)
+
+
+def fact_parallel(n: int, workers: int = None, chunks: int = None) -> int:
+    """
+    Факториал на нескольких процессах: 2..n делится на диапазоны, частичные
+    произведения считаются в ProcessPoolExecutor (умножение больших чисел
+    держит GIL, потоки не помогают) и сводятся сбалансированным деревом.
+    """
+    workers = workers or os.cpu_count() or 1
+    if n < 2:
+        return 1
+    if workers == 1:
+        return fact_binary_split(n)
+    # диапазонов больше, чем процессов, чтобы выровнять нагрузку
+    chunks = chunks or workers * 4
+    size = max(1, (n - 1) // chunks + 1)
+    ranges = [(lo, min(lo + size - 1, n)) for lo in range(2, n + 1, size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_range_product, ranges))
+    return _product_list(parts)
+
+
+def parallel_speedup(n: int, worker_counts) -> list:
+    """Время fact_parallel(n) для разного числа процессов: [(процессы, сек, ускорение)]"""
+    curve = []
+    base = None
+    for workers in worker_counts:
+        elapsed = benchmark(lambda m: fact_parallel(m, workers), [n], number=1, repeat=1, warmup=0)
+        if base is None:
+            base = elapsed
+        curve.append((workers, elapsed, base / elapsed))
+    return curve
+
+
+class FactorialCache:
+    """
+    Кеш факториалов с контрольными точками (checkpoints).
+
+    Хранит k! только для k, кратных step, в LRU-таблице с ограничением по
+    байтам. fact(n) берет ближайшую точку c <= n и домножает c+1..n.
+    Если задан path, точки дополнительно сохраняются в каталог на диск и
+    читаются оттуда через mmap после вытеснения из памяти.
+    """
+
+    def __init__(self, step: int = 1000, max_bytes: int = 64 * 2 ** 20,
+                 path: str = None, base=None):
+        self.step = step
+        self.max_bytes = max_bytes
+        self.path = path
+        self.base = base or fact_prime_swing
+        self._table = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def _size(value: int) -> int:
+        return (value.bit_length() + 7) // 8
+
+    def _disk_file(self, k: int) -> str:
+        return os.path.join(self.path, f"{k}.fact")
+
+    def _store(self, k: int, value: int) -> None:
+        if self.path and not os.path.exists(self._disk_file(k)):
+            with open(self._disk_file(k), "wb") as f:
+                f.write(value.to_bytes(self._size(value), "little"))
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        self._table[k] = value
+        self._bytes += size
+        # вытесняем давно не использованные точки
+        while self._bytes > self.max_bytes:
+            _, old = self._table.popitem(last=False)
+            self._bytes -= self._size(old)
+
+    def _load(self, k: int):
+        if k in self._table:
+            self._table.move_to_end(k)
+            return self._table[k]
+        if self.path and os.path.exists(self._disk_file(k)):
+            with open(self._disk_file(k), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    value = int.from_bytes(mm, "little")
+            self.disk_hits += 1
+            self._store(k, value)
+            return value
+        return None
+
+    def fact(self, n: int) -> int:
+        if n < 2:
+            return 1
+        target = n - n % self.step
+        # ищем ближайшую сохраненную точку не больше n
+        k = target
+        value = None
+        while k > 0:
+            value = self._load(k)
+            if value is not None:
+                break
+            k -= self.step
+        if value is None:
+            self.misses += 1
+            value = self.base(target)
+        else:
+            self.hits += 1
+            value *= _product(k + 1, target)
+        if target > 0 and target != k:
+            self._store(target, value)
+        return value * _product(target + 1, n)
+
+    __call__ = fact
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "entries": len(self._table),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def check_against_math(funcs, data) -> None:
+    """Сверяет результаты функций с math.factorial"""
+    for func in funcs:
+        for n in data:
+            if func(n) != math.factorial(n):
+                raise AssertionError(f"{func.__name__}({n}) != math.factorial({n})")
+
+
+def benchmark(func, data, number=None, repeat=5, warmup=1):
+    """
+    Возвращает среднее по data медианное время одного вызова func (сек).
+
+    Замер идет через bench.measure (bench.py из корня репозитория,
+    импортируется при первом замере): прогрев, автоподбор number (если
+    не задан), отключенный сборщик мусора.
+    """
+    import bench
     total = 0
     for n in data:
-        # несколько повторов для усреднения
-        times = timeit.repeat(lambda: func(n), number=number, repeat=repeat)
+        result = bench.measure(lambda: func(n), param=n, number=number, repeat=repeat,
+                         warmup=warmup)
         print(".", end="")
-        total += min(times)  # берём минимальное время из серии
+        total += result.median
     return total / len(data)
 
+# Тесты
+class TestFactorial(unittest.TestCase):
+    def test_against_math(self):
+        """Все варианты совпадают с math.factorial"""
+        check_against_math([fact_recursive], list(range(0, 200)))
+        funcs = [fact_iterative, fact_binary_split, fact_prime_swing]
+        check_against_math(funcs, list(range(0, 200)) + [1000, 4321])
+        with self.assertRaises(AssertionError):
+            check_against_math([lambda n: n], [3])
+
+    def test_primes(self):
+        self.assertEqual(_primes_up_to(30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(_primes_up_to(1), [])
+
+    def test_parallel(self):
+        """Параллельный режим на нескольких процессах и на одном"""
+        check_against_math([lambda n: fact_parallel(n, workers=2)], [0, 1, 2, 7, 500, 3001])
+        check_against_math([lambda n: fact_parallel(n, workers=1)], [0, 10, 500])
+        self.assertEqual(fact_parallel(100, workers=2, chunks=50), math.factorial(100))
+
+    def test_cache_hits(self):
+        """Соседние n считаются от сохраненной контрольной точки"""
+        cache = FactorialCache(step=10)
+        self.assertEqual(cache(25), math.factorial(25))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(cache(27), math.factorial(27))
+        self.assertEqual(cache(45), math.factorial(45))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(list(cache._table), [20, 40])
+        self.assertEqual(cache(1), 1)
+
+    def test_cache_eviction(self):
+        """LRU-вытеснение по байтам: 5! - 1 байт, 10! - 3 байта, 15! - 6 байт"""
+        cache = FactorialCache(step=5, max_bytes=9)
+        cache(5)
+        cache(10)
+        cache._load(5)
+        cache._store(15, math.factorial(15))
+        self.assertEqual(list(cache._table), [5, 15])
+        self.assertEqual(cache.stats()["bytes"], 7)
+        """Значение больше бюджета в памяти не хранится"""
+        cache._store(25, math.factorial(25))
+        self.assertNotIn(25, cache._table)
+        self.assertLessEqual(cache.stats()["bytes"], cache.max_bytes)
+
+    def test_cache_disk_reload(self):
+        """Вытесненные точки читаются с диска через mmap, в том числе новым кешем"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = FactorialCache(step=5, max_bytes=0, path=tmp)
+            self.assertEqual(cache(12), math.factorial(12))
+            self.assertEqual(cache.stats()["entries"], 0)
+            self.assertEqual(cache(14), math.factorial(14))
+            self.assertEqual(cache.disk_hits, 1)
+            reopened = FactorialCache(step=5, path=tmp)
+            self.assertEqual(reopened(13), math.factorial(13))
+            self.assertEqual((reopened.disk_hits, reopened.hits, reopened.misses), (1, 1, 0))
+            self.assertEqual(list(reopened._table), [10])
+
 if __name__ == "__main__":
+    # при запуске скриптом корень репозитория (bench.py) не виден для импорта
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    unittest.main(argv=[''], verbosity=2, exit=False)
+
     # фиксированный набор данных
     test_data = list(range(30, 600, 30))
 
+    check_against_math([fact_recursive, fact_iterative, fact_binary_split, fact_prime_swing], test_data)
+
     res_recursive = []
     res_iterative = []
+    res_fast = []
     print("Выполнение:", end="")
     for n in test_data:
-        res_recursive.append(benchmark(fact_recursive, [n], number=10000, repeat=5))
-        res_iterative.append(benchmark(fact_iterative, [n], number=10000, repeat=5))
+        res_recursive.append(benchmark(fact_recursive, [n]))
+        res_iterative.append(benchmark(fact_iterative, [n]))
+        res_fast.append(benchmark(fact_prime_swing, [n]))
 
-    # Визуализация
+    # Визуализация (matplotlib нужен только здесь)
+    import matplotlib.pyplot as plt
     plt.plot(test_data, res_recursive, label="Рекурсивный")
     plt.plot(test_data, res_iterative, label="Итеративный")
+    plt.plot(test_data, res_fast, label="Prime swing")
     plt.xlabel("n")
     plt.ylabel("Время (сек)")
     plt.title("Сравнение рекурсивного и итеративного факториала")
     plt.legend()
+    plt.show()
+
+    # Большие n: рекурсивный вариант не выдерживает глубины рекурсии
+    big_data = [10000, 30000, 100000]
+    check_against_math([fact_binary_split, fact_prime_swing], big_data[:2])
+    print("\n     n | Итеративный | Бин. разбиение | Prime swing")
+    for n in big_data:
+        t_iter = benchmark(fact_iterative, [n], number=1, repeat=1, warmup=0)
+        t_split = benchmark(fact_binary_split, [n], number=1, repeat=3, warmup=0)
+        t_swing = benchmark(fact_prime_swing, [n], number=1, repeat=3, warmup=0)
+        print(f"\n{n:6} | {t_iter:11.4f} | {t_split:14.4f} | {t_swing:11.4f}")
+
+    # Соседние n через кеш контрольных точек
+    cache = FactorialCache(step=1000)
+    nearby = [100000 + 37 * i for i in range(20)]
+    t_cached = benchmark(cache, nearby, number=1, repeat=1, warmup=0)
+    t_plain = benchmark(fact_prime_swing, nearby, number=1, repeat=1, warmup=0)
+    print(f"\nСоседние n: без кеша {t_plain:.4f} с, с кешем {t_cached:.4f} с, {cache.stats()}")
+
+    # Ускорение параллельного режима от числа процессов
+    check_against_math([lambda m: fact_parallel(m, 2)], [5000])
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    curve = parallel_speedup(200000, worker_counts)
+    print("\nПроцессов | Время (сек) | Ускорение")
+    for workers, elapsed, speedup in curve:
+        print(f"{workers:9} | {elapsed:11.4f} | {speedup:9.2f}")
+    plt.figure()
+    plt.plot([c[0] for c in curve], [c[2] for c in curve], "o-", label="fact_parallel")
+    plt.plot(worker_counts, worker_counts, "--", label="Идеальное")
+    plt.xlabel("Число процессов")
+    plt.ylabel("Ускорение")
+    plt.title("Ускорение параллельного факториала (n = 200000)")
+    plt.legend()
     plt.show()
\ No newline at end of file
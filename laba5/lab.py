@@ -1,5 +1,13 @@
-﻿from collections import deque, namedtuple
-from typing import Any, Callable, Dict, List, Optional, Union
+﻿import ast
+import mmap
+import os
+import sys
+import tempfile
+import timeit
+import unittest
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 Node = namedtuple('Node', ['value', 'left', 'right'])
 
@@ -7,9 +15,15 @@ def gen_bin_tree(
     height: int = 4,
     root: int = 4,
     left_branch: Callable[[Any], Any] = lambda x: x * 4,
-    right_branch: Callable[[Any], Any] = lambda x: x + 1
-) -> Dict[str, Any]:
+    right_branch: Callable[[Any], Any] = lambda x: x + 1,
+    layout: str = 'dict'
+) -> Any:
     """Генерирует бинарное дерево нерекурсивным способом."""
+    """layout: dict, list, namedtuple, slots, soa, shared или lazy"""
+    if layout != 'dict':
+        if layout not in LAYOUTS:
+            raise ValueError(f"Неизвестный формат дерева: {layout}")
+        return LAYOUTS[layout](height, root, left_branch, right_branch)
     if height <= 0:
         return {}
     """Создаем корневой узел"""
@@ -68,6 +82,128 @@ def gen_bin_tree_list(
     return tree_list
 
 
+def iter_bin_tree(
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = lambda x: x * 4,
+    right_branch: Callable[[Any], Any] = lambda x: x + 1,
+    by_level: bool = False
+) -> Iterator[Union[Tuple[int, Any], List[Any]]]:
+    """Потоковый вариант gen_bin_tree_list: пары (индекс, значение) или целые уровни в порядке кучи."""
+    """В памяти одновременно держится только текущий уровень"""
+    level = [root]
+    index = 0
+    for depth in range(height):
+        if by_level:
+            yield level
+        else:
+            for value in level:
+                yield index, value
+                index += 1
+        if depth == height - 1:
+            break
+        children = []
+        for value in level:
+            children.append(left_branch(value))
+            children.append(right_branch(value))
+        level = children
+
+
+"""Формат .npy (версия 1.0) пишем сами, чтобы не требовать numpy для записи"""
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+_NPY_DESCR = '<i8' if sys.byteorder == 'little' else '>i8'
+
+
+def _npy_header(count: int) -> bytes:
+    header = f"{{'descr': '{_NPY_DESCR}', 'fortran_order': False, 'shape': ({count},), }}"
+    """Заголовок дополняется пробелами до кратности 64 байтам и заканчивается переводом строки"""
+    total = len(_NPY_MAGIC) + 2 + len(header) + 1
+    header += ' ' * (-total % 64) + '\n'
+    return _NPY_MAGIC + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+
+def write_bin_tree(
+    path: str,
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = lambda x: x * 4,
+    right_branch: Callable[[Any], Any] = lambda x: x + 1,
+    npy: bool = True,
+    chunk_size: int = 65536
+) -> int:
+    """
+    Записывает дерево в порядке кучи в файл int64 (.npy или сырой), не держа его в памяти.
+
+    Предыдущий уровень читается обратно из самого файла порциями по chunk_size,
+    поэтому память ограничена порцией, а не уровнем. Возвращает число узлов.
+    Значения должны помещаться в int64.
+    """
+    count = max(0, 2 ** height - 1)
+    with open(path, 'wb') as out, open(path, 'rb') as back:
+        offset = 0
+        if npy:
+            header = _npy_header(count)
+            out.write(header)
+            offset = len(header)
+        if count == 0:
+            return 0
+        array('q', [root]).tofile(out)
+        level_start, level_size = offset, 1
+        for _ in range(height - 1):
+            out.flush()
+            for start in range(0, level_size, chunk_size):
+                back.seek(level_start + start * 8)
+                parents = array('q')
+                parents.frombytes(back.read(min(chunk_size, level_size - start) * 8))
+                children = array('q', bytes(16 * len(parents)))
+                children[0::2] = array('q', map(left_branch, parents))
+                children[1::2] = array('q', map(right_branch, parents))
+                children.tofile(out)
+            level_start += level_size * 8
+            level_size *= 2
+    return count
+
+
+def open_bin_tree(path: str, npy: bool = True):
+    """
+    Отображает файл из write_bin_tree в память без чтения целиком:
+    numpy.memmap, если numpy установлен, иначе memoryview типа 'q'.
+    """
+    offset = 0
+    if npy:
+        with open(path, 'rb') as f:
+            prefix = f.read(len(_NPY_MAGIC) + 2)
+            header_len = int.from_bytes(prefix[-2:], 'little')
+            header = ast.literal_eval(f.read(header_len).decode('latin1'))
+        offset = len(prefix) + header_len
+        if header['descr'] != _NPY_DESCR:
+            raise ValueError(f"Ожидался тип {_NPY_DESCR}, в файле {header['descr']}")
+    empty = os.path.getsize(path) <= offset
+    try:
+        import numpy as np
+    except ImportError:
+        if empty:
+            return memoryview(array('q'))
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mapped)[offset:].cast('q')
+    if empty:
+        return np.empty(0, dtype=_NPY_DESCR)
+    return np.memmap(path, dtype=_NPY_DESCR, mode='r', offset=offset)
+
+
+def _gen_levels(height, root, left_branch, right_branch) -> List[List[Any]]:
+    """Значения дерева по уровням в порядке кучи (сверху вниз)"""
+    levels = [[root]]
+    for _ in range(height - 1):
+        level = []
+        for value in levels[-1]:
+            level.append(left_branch(value))
+            level.append(right_branch(value))
+        levels.append(level)
+    return levels
+
+
 def gen_bin_tree_namedtuple(
     height: int = 4,
     root: int = 4,
@@ -77,35 +213,264 @@ def gen_bin_tree_namedtuple(
     """Генерирует бинарное дерево с использованием namedtuple."""
     if height <= 0:
         return None
-    """Очередь для обхода: (родительский namedtuple, значение, уровень)"""
+    """namedtuple неизменяем, поэтому строим снизу вверх: потомки создаются раньше родителя"""
+    levels = _gen_levels(height, root, left_branch, right_branch)
+    below = [Node(value=value, left=None, right=None) for value in levels[-1]]
+    for level in reversed(levels[:-1]):
+        below = [
+            Node(value=value, left=below[2 * k], right=below[2 * k + 1])
+            for k, value in enumerate(level)
+        ]
+    return below[0]
+
+
+class SlotNode:
+    """Изменяемый узел дерева без __dict__: атрибуты хранятся в __slots__."""
+    __slots__ = ('value', 'left', 'right')
+
+    def __init__(self, value: Any, left: Optional['SlotNode'] = None,
+                 right: Optional['SlotNode'] = None):
+        self.value = value
+        self.left = left
+        self.right = right
+
+    def __repr__(self) -> str:
+        return f"SlotNode(value={self.value!r}, left={self.left!r}, right={self.right!r})"
+
+
+def gen_bin_tree_slots(
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = lambda x: x * 4,
+    right_branch: Callable[[Any], Any] = lambda x: x + 1
+) -> Optional[SlotNode]:
+    """Генерирует бинарное дерево из узлов SlotNode нерекурсивным способом."""
+    if height <= 0:
+        return None
+    tree = SlotNode(root)
     queue = deque()
-    """Создаем корневой узел"""
-    root_node = Node(value=root, left=None, right=None)
-    queue.append((root_node, root, 1))
-    """Словарь для связи значений с их узлами (для обновления)"""
-    nodes_dict = {id(root_node): root_node}
+    queue.append((tree, 1))
     while queue:
-        parent_node, parent_value, level = queue.popleft()
+        node, level = queue.popleft()
         if level >= height:
             continue
-        """Вычисляем значения потомков"""
-        left_value = left_branch(parent_value)
-        right_value = right_branch(parent_value)
-        """Создаем узлы-потомки"""
-        left_node = Node(value=left_value, left=None, right=None)
-        right_node = Node(value=right_value, left=None, right=None)
-        """Обновляем родительский узел (namedtuple неизменяем, создаем новый)"""
-        new_parent_node = Node(
-            value=parent_node.value,
-            left=left_node,
-            right=right_node
-        )
-        """Обновляем словарь"""
-        nodes_dict[id(new_parent_node)] = new_parent_node
-        """Добавляем потомков в очередь"""
-        queue.append((left_node, left_value, level + 1))
-        queue.append((right_node, right_value, level + 1))
-    return root_node
+        node.left = SlotNode(left_branch(node.value))
+        node.right = SlotNode(right_branch(node.value))
+        queue.append((node.left, level + 1))
+        queue.append((node.right, level + 1))
+    return tree
+
+
+"""Структура массивов: значения и индексы потомков в параллельных массивах (-1 - нет потомка)"""
+TreeArrays = namedtuple('TreeArrays', ['values', 'left_idx', 'right_idx'])
+
+
+def gen_bin_tree_soa(
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = lambda x: x * 4,
+    right_branch: Callable[[Any], Any] = lambda x: x + 1
+) -> TreeArrays:
+    """Генерирует бинарное дерево в виде структуры массивов (values, left_idx, right_idx)."""
+    if height <= 0:
+        return TreeArrays(array('q'), array('q'), array('q'))
+    values = [value for level in _gen_levels(height, root, left_branch, right_branch)
+              for value in level]
+    """Целые значения храним в array('q'), остальные (или слишком большие) - в списке"""
+    try:
+        values = array('q', values)
+    except (TypeError, OverflowError):
+        pass
+    size = len(values)
+    internal = size // 2
+    left_idx = array('q', range(1, 2 * internal, 2)) + array('q', [-1]) * (size - internal)
+    right_idx = array('q', range(2, 2 * internal + 1, 2)) + array('q', [-1]) * (size - internal)
+    return TreeArrays(values, left_idx, right_idx)
+
+def gen_bin_tree_shared(
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = lambda x: x * 4,
+    right_branch: Callable[[Any], Any] = lambda x: x + 1
+) -> Dict[str, Any]:
+    """Генерирует дерево с общими поддеревьями (hash-consing по (значение, оставшаяся высота))."""
+    if height <= 0:
+        return {}
+    """Уникальные значения на каждом уровне (значения должны быть хешируемыми)"""
+    levels = [{root}]
+    for _ in range(height - 1):
+        levels.append({child for value in levels[-1]
+                       for child in (left_branch(value), right_branch(value))})
+    """Строим снизу вверх, одинаковые поддеревья создаются один раз"""
+    memo = {value: {'value': value, 'left': None, 'right': None} for value in levels[-1]}
+    for level in reversed(levels[:-1]):
+        memo = {
+            value: {
+                'value': value,
+                'left': memo[left_branch(value)],
+                'right': memo[right_branch(value)]
+            }
+            for value in level
+        }
+    return memo[root]
+
+
+def count_nodes(tree: Dict[str, Any], unique: bool = False) -> int:
+    """Считает узлы дерева без рекурсии; unique=True - различные объекты-узлы."""
+    if not tree:
+        return 0
+    """Размер каждого различного узла считается один раз (важно для общих поддеревьев)"""
+    memo = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in memo:
+            continue
+        kids = [child for child in (node['left'], node['right']) if child]
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((kid, False) for kid in kids if id(kid) not in memo)
+            continue
+        memo[id(node)] = 1 + sum(memo[id(kid)] for kid in kids)
+    return len(memo) if unique else memo[id(tree)]
+
+class LazyNode:
+    """Узел ленивого дерева: потомки вычисляются только при обращении к left/right."""
+    __slots__ = ('tree', 'index', 'value')
+
+    def __init__(self, tree: 'LazyTree', index: int, value: Any):
+        self.tree = tree
+        self.index = index
+        self.value = value
+
+    @property
+    def depth(self) -> int:
+        return (self.index + 1).bit_length() - 1
+
+    @property
+    def left(self) -> Optional['LazyNode']:
+        return self.tree._child(self, 1)
+
+    @property
+    def right(self) -> Optional['LazyNode']:
+        return self.tree._child(self, 2)
+
+    def to_dict(self, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Материализует поддерево в формате gen_bin_tree (не глубже max_depth уровней)."""
+        if max_depth is None and self.tree.height is None:
+            raise ValueError("Для дерева без ограничения высоты нужен max_depth")
+        result = {'value': self.value, 'left': None, 'right': None}
+        stack = [(self, result, 1)]
+        while stack:
+            node, target, level = stack.pop()
+            if max_depth is not None and level >= max_depth:
+                continue
+            for side in ('left', 'right'):
+                child = getattr(node, side)
+                if child is not None:
+                    target[side] = {'value': child.value, 'left': None, 'right': None}
+                    stack.append((child, target[side], level + 1))
+        return result
+
+    def __repr__(self) -> str:
+        return f"LazyNode(index={self.index}, value={self.value!r})"
+
+
+class LazyTree:
+    """
+    Ленивое бинарное дерево: значения вычисляются через left_branch/right_branch
+    только для посещенных узлов. Узлы адресуются индексом кучи (потомки i -
+    2*i + 1 и 2*i + 2) или путем из битов ('0' - влево, '1' - вправо), поэтому
+    узел на глубине 40 вычисляется за 40 вызовов, без построения 2**40 узлов.
+    height=None - дерево без ограничения высоты.
+    """
+
+    def __init__(
+        self,
+        height: Optional[int] = 4,
+        root: Any = 4,
+        left_branch: Callable[[Any], Any] = lambda x: x * 4,
+        right_branch: Callable[[Any], Any] = lambda x: x + 1,
+        memoize: bool = True,
+        cache_size: Optional[int] = 4096
+    ):
+        self.height = height
+        self.left_branch = left_branch
+        self.right_branch = right_branch
+        self.memoize = memoize
+        self.cache_size = cache_size
+        """Кеш значений по индексу кучи (LRU, если задан cache_size)"""
+        self._cache: 'OrderedDict[int, Any]' = OrderedDict()
+        self.root = LazyNode(self, 0, root) if height is None or height > 0 else None
+        self.computed = 0
+
+    def _remember(self, index: int, value: Any) -> None:
+        if not self.memoize:
+            return
+        self._cache[index] = value
+        if self.cache_size is not None and len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _child_value(self, index: int, value: Any, offset: int) -> Any:
+        child = 2 * index + offset
+        if self.memoize and child in self._cache:
+            self._cache.move_to_end(child)
+            return self._cache[child]
+        branch = self.left_branch if offset == 1 else self.right_branch
+        child_value = branch(value)
+        self.computed += 1
+        self._remember(child, child_value)
+        return child_value
+
+    def _child(self, node: LazyNode, offset: int) -> Optional[LazyNode]:
+        if self.height is not None and node.depth + 1 >= self.height:
+            return None
+        return LazyNode(self, 2 * node.index + offset,
+                        self._child_value(node.index, node.value, offset))
+
+    def node_at(self, path: str) -> LazyNode:
+        """Узел по пути из битов: '' - корень, '01' - влево, затем вправо."""
+        if self.root is None:
+            raise IndexError("Пустое дерево")
+        if self.height is not None and len(path) >= self.height:
+            raise IndexError(f"Путь длины {len(path)} глубже высоты дерева {self.height}")
+        index, value = self.root.index, self.root.value
+        for step in path:
+            if step not in '01':
+                raise ValueError(f"Путь должен состоять из '0' и '1': {path!r}")
+            offset = 1 if step == '0' else 2
+            value = self._child_value(index, value, offset)
+            index = 2 * index + offset
+        return LazyNode(self, index, value)
+
+    def __getitem__(self, index: int) -> Any:
+        """Значение узла по индексу кучи."""
+        if index < 0:
+            raise IndexError(index)
+        """Биты index + 1 без старшей единицы - путь от корня"""
+        return self.node_at(bin(index + 1)[3:]).value
+
+
+def gen_bin_tree_lazy(
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = lambda x: x * 4,
+    right_branch: Callable[[Any], Any] = lambda x: x + 1
+) -> LazyTree:
+    """Ленивое дерево: узлы вычисляются при первом обращении."""
+    return LazyTree(height, root, left_branch, right_branch)
+
+
+"""Построители по названию формата для gen_bin_tree(layout=...)"""
+LAYOUTS = {
+    'dict': gen_bin_tree,
+    'list': gen_bin_tree_list,
+    'namedtuple': gen_bin_tree_namedtuple,
+    'slots': gen_bin_tree_slots,
+    'soa': gen_bin_tree_soa,
+    'shared': gen_bin_tree_shared,
+    'lazy': gen_bin_tree_lazy,
+}
 
 def print_tree_dict(tree: Dict[str, Any], level: int = 0) -> None:
     """Выводит дерево в виде словаря в удобочитаемом формате."""
@@ -126,6 +491,130 @@ def print_tree_dict(tree: Dict[str, Any], level: int = 0) -> None:
         print(f"{indent}  'right': None")
     print(f"{indent}}}", end=",\n" if level > 0 else "\n")
 
+
+def _heap_values(tree: Any) -> List[Any]:
+    """Значения дерева любого формата в порядке кучи (для сравнения форматов)"""
+    if isinstance(tree, list):
+        return tree
+    if isinstance(tree, TreeArrays):
+        return list(tree.values)
+    if isinstance(tree, LazyTree):
+        if tree.root is None:
+            return []
+        return [tree[index] for index in range(2 ** tree.height - 1)]
+    values = []
+    queue = deque([tree] if tree else [])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, dict):
+            values.append(node['value'])
+            kids = (node['left'], node['right'])
+        else:
+            values.append(node.value)
+            kids = (node.left, node.right)
+        queue.extend(kid for kid in kids if kid)
+    return values
+
+
+# Тесты
+class TestTreeLayouts(unittest.TestCase):
+    def test_layouts_match_list(self):
+        """Все форматы дают те же значения в порядке кучи, что и gen_bin_tree_list"""
+        branches = [{}, {'left_branch': lambda x: x * 2, 'right_branch': lambda x: x * 3}]
+        for height in (0, 1, 2, 5):
+            for kwargs in branches:
+                expected = gen_bin_tree_list(height, 1, **kwargs)
+                for name in LAYOUTS:
+                    with self.subTest(layout=name, height=height):
+                        tree = gen_bin_tree(height, 1, layout=name, **kwargs)
+                        self.assertEqual(_heap_values(tree), expected)
+
+    def test_namedtuple_root_has_children(self):
+        """Корень namedtuple-дерева связан с потомками, листья - без потомков"""
+        tree = gen_bin_tree_namedtuple(height=3, root=1)
+        self.assertEqual((tree.left.value, tree.right.value), (4, 2))
+        self.assertEqual(tree.left.left.value, 16)
+        self.assertIsNone(tree.left.left.left)
+        self.assertIsNone(gen_bin_tree_namedtuple(height=0))
+
+    def test_soa_indices(self):
+        """Индексы потомков в структуре массивов указывают на узлы кучи"""
+        tree = gen_bin_tree_soa(height=3, root=1)
+        self.assertEqual(list(tree.left_idx), [1, 3, 5, -1, -1, -1, -1])
+        self.assertEqual(list(tree.right_idx), [2, 4, 6, -1, -1, -1, -1])
+        self.assertEqual(tree.values[tree.right_idx[0]], 2)
+
+    def test_unknown_layout(self):
+        with self.assertRaises(ValueError):
+            gen_bin_tree(layout='xml')
+
+    def test_lazy_node_at(self):
+        """Ленивое дерево вычисляет только узлы на пути"""
+        lazy = LazyTree(height=None, root=1)
+        node = lazy.node_at('1' * 39 + '0')
+        self.assertEqual(node.value, 40 * 4)
+        self.assertEqual(node.depth, 40)
+        self.assertEqual(lazy.computed, 40)
+        lazy.node_at('1' * 39 + '0')
+        self.assertEqual(lazy.computed, 40)
+        self.assertEqual(lazy.root.left.right.value, 5)
+        with self.assertRaises(ValueError):
+            lazy.root.to_dict()
+        self.assertEqual(lazy.root.to_dict(max_depth=2),
+                         {'value': 1, 'left': {'value': 4, 'left': None, 'right': None},
+                          'right': {'value': 2, 'left': None, 'right': None}})
+
+    def test_lazy_bounds(self):
+        """Выход за высоту дерева и неверный путь"""
+        lazy = gen_bin_tree_lazy(height=3, root=1)
+        self.assertEqual(lazy[6], gen_bin_tree_list(3, 1)[6])
+        self.assertIsNone(lazy.node_at('01').left)
+        with self.assertRaises(IndexError):
+            lazy.node_at('011')
+        with self.assertRaises(IndexError):
+            lazy[7]
+        with self.assertRaises(IndexError):
+            lazy[-1]
+        with self.assertRaises(ValueError):
+            lazy.node_at('02')
+        with self.assertRaises(IndexError):
+            gen_bin_tree_lazy(height=0).node_at('')
+
+    def test_iter_bin_tree(self):
+        """Потоковая генерация совпадает со списком"""
+        expected = gen_bin_tree_list(5, 1)
+        self.assertEqual([value for _, value in iter_bin_tree(5, 1)], expected)
+        self.assertEqual([index for index, _ in iter_bin_tree(5, 1)], list(range(len(expected))))
+        self.assertEqual([len(level) for level in iter_bin_tree(5, 1, by_level=True)], [1, 2, 4, 8, 16])
+
+    def test_npy_roundtrip(self):
+        """Запись в .npy и сырой файл и чтение через отображение в память"""
+        expected = gen_bin_tree_list(6, 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            for npy in (True, False):
+                path = os.path.join(tmp, 'tree.npy' if npy else 'tree.bin')
+                count = write_bin_tree(path, height=6, root=1, npy=npy, chunk_size=3)
+                self.assertEqual(count, len(expected))
+                self.assertEqual([int(value) for value in open_bin_tree(path, npy=npy)], expected)
+            try:
+                import numpy as np
+            except ImportError:
+                np = None
+            if np is not None:
+                self.assertEqual(np.load(os.path.join(tmp, 'tree.npy')).tolist(), expected)
+            empty = os.path.join(tmp, 'empty.npy')
+            self.assertEqual(write_bin_tree(empty, height=0), 0)
+            self.assertEqual(len(open_bin_tree(empty)), 0)
+
+    def test_shared_count_nodes(self):
+        """Общие поддеревья: логических узлов 2**h - 1, объектов меньше"""
+        tree = gen_bin_tree_shared(height=8, root=0)
+        self.assertEqual(count_nodes(tree), 2 ** 8 - 1)
+        self.assertLess(count_nodes(tree, unique=True), 2 ** 8 - 1)
+        plain = gen_bin_tree(height=8, root=0)
+        self.assertEqual(count_nodes(plain), count_nodes(plain, unique=True))
+        self.assertEqual(count_nodes({}), 0)
+
 if __name__ == "__main__":
     """Пример 1: Дерево по умолчанию"""
     print("Пример 1: Дерево по умолчанию (height=4, root=4):")
@@ -144,6 +633,11 @@ if __name__ == "__main__":
         right_branch=lambda x: x * 3
     )
     print_tree_dict(tree3)
+    """Пример 3а: Дерево с общими поддеревьями"""
+    print("\nПример 3а: Общие поддеревья (height=12, root=0):")
+    tree_shared = gen_bin_tree_shared(height=12, root=0)
+    print(f"Логических узлов: {count_nodes(tree_shared)}, "
+          f"различных объектов: {count_nodes(tree_shared, unique=True)}")
     """Пример 4: Представление в виде списка"""
     print("\nПример 4: Дерево в виде списка:")
     tree_list = gen_bin_tree_list(height=3, root=1)
@@ -156,4 +650,25 @@ if __name__ == "__main__":
         if tree_namedtuple.left:
             print(f"Левый потомок корня: {tree_namedtuple.left.value}")
         if tree_namedtuple.right:
-            print(f"Правый потомок корня: {tree_namedtuple.right.value}")
\ No newline at end of file
+            print(f"Правый потомок корня: {tree_namedtuple.right.value}")
+    """Пример 6: __slots__ и структура массивов"""
+    print("\nПример 6: SlotNode и структура массивов:")
+    print(gen_bin_tree(height=2, root=1, layout='slots'))
+    print(gen_bin_tree(height=3, root=1, layout='soa'))
+    """Пример 6а: Ленивое дерево - узел на глубине 40 без построения всего дерева"""
+    print("\nПример 6а: Ленивое дерево высотой 41:")
+    lazy = gen_bin_tree(height=41, root=1, layout='lazy')
+    print(f"Путь '1' * 39 + '0': {lazy.node_at('1' * 39 + '0').value}, вычислено узлов: {lazy.computed}")
+    """Пример 6б: Потоковая запись дерева в .npy"""
+    print("\nПример 6б: Потоковая запись в .npy:")
+    with tempfile.TemporaryDirectory() as tmp:
+        npy_path = os.path.join(tmp, 'tree.npy')
+        write_bin_tree(npy_path, height=4, root=1)
+        print([int(value) for value in open_bin_tree(npy_path)])
+    """Пример 7: Сравнение форматов по времени построения (height=12)"""
+    print("\nПример 7: Время построения дерева высотой 12:")
+    for name in LAYOUTS:
+        elapsed = min(timeit.repeat(lambda: gen_bin_tree(height=12, layout=name), number=5, repeat=3)) / 5
+        print(f"{name:>10}: {elapsed:.6f} сек")
+    """Запуск тестов"""
+    unittest.main(argv=[''], verbosity=2, exit=False)
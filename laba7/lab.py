@@ -1,6 +1,14 @@
 ﻿import sys
 import io
+import asyncio
+import atexit
+import inspect
+import itertools
 import logging
+import queue
+import reprlib
+import threading
+import time
 import requests
 import json
 import math
@@ -11,54 +19,476 @@ from typing import Dict, List
 
 
 """ 1. Реализовать декоратор logger """
-def logger(func=None, *, handle=sys.stdout):
+def _call_message(name, args, kwargs, fmt=repr):
+    args_repr = [fmt(a) for a in args]
+    kwargs_repr = [f"{k}={fmt(v)}" for k, v in kwargs.items()]
+    signature = ", ".join(args_repr + kwargs_repr)
+    return f"Function '{name}' called with args: ({signature})"
+
+
+def _return_message(name, result, fmt=repr):
+    return f"Function '{name}' returned: {fmt(result)}"
+
+
+def _limited_repr(max_repr):
+    """
+    repr с ограничением длины. reprlib обрезает длинные строки и показывает
+    лишь первые элементы коллекций, поэтому полный repr большого списка или
+    словаря не строится.
+    """
+    if max_repr is None:
+        return repr
+    limiter = reprlib.Repr()
+    limiter.maxstring = limiter.maxother = limiter.maxlong = max_repr
+    items = max(1, max_repr // 4)
+    limiter.maxlist = limiter.maxtuple = limiter.maxdict = items
+    limiter.maxset = limiter.maxfrozenset = limiter.maxdeque = limiter.maxarray = items
+    def fmt(value):
+        text = limiter.repr(value)
+        return text if len(text) <= max_repr else text[:max_repr] + "..."
+    return fmt
+
+
+def _error_message(name, e):
+    return f"Function '{name}' raised {type(e).__name__}: {str(e)}"
+
+
+"""Запись лога: (уровень, время вызова, функция построения сообщения, ее аргументы)"""
+_MESSAGE_BUILDERS = {
+    "call": _call_message,
+    "return": _return_message,
+    "error": _error_message,
+}
+
+
+def _format_time(timestamp):
+    """Время записи (time.time()) в формате лога; форматируется только при записи."""
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _write_message(handle, level, timestamp, message):
+    """Синхронная запись одного сообщения в handle (поток или logging.Logger)."""
+    if isinstance(handle, logging.Logger):
+        handle.log(logging.ERROR if level == "ERROR" else logging.INFO, message)
+    else:
+        handle.write(f"[{_format_time(timestamp)}] {level}: {message}\n")
+        if hasattr(handle, 'flush'):
+            handle.flush()
+
+
+class AsyncLogWriter:
+    """
+    Фоновая запись логов: декорированная функция только кладет дешевую запись
+    в ограниченную очередь, а фоновый поток форматирует записи (repr аргументов
+    и результата), пишет их пачками и периодически вызывает flush.
+
+    Args:
+        handle: Цель для логирования (поток или logging.Logger)
+        maxsize: Размер очереди
+        policy: "block" - ждать места в очереди, "drop" - отбрасывать запись
+        batch_size: Сколько записей писать за одну операцию write
+        flush_interval: Период flush в секундах
+
+    Аргументы форматируются в фоновом потоке, поэтому изменяемые объекты,
+    измененные после вызова, попадут в лог уже измененными.
+    При выходе из программы очередь дописывается (atexit).
+    """
+    _STOP = object()
+
+    def __init__(self, handle=sys.stdout, maxsize=10000, policy="block",
+                 batch_size=512, flush_interval=0.5):
+        if policy not in ("block", "drop"):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.handle = handle
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, record, block=True):
+        """
+        Кладет запись в очередь согласно политике; вызывается из декоратора.
+        block=False - никогда не ждать (для корутин): при полной очереди или
+        после close запись отбрасывается и учитывается в dropped.
+        """
+        if self._closed:
+            if not block:
+                self.dropped += 1
+                return
+            self._write_batch([record])
+            self._flush_handle()
+            return
+        if self.policy == "drop" or not block:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self._queue.put(record)
+
+    def _write_batch(self, batch):
+        if isinstance(self.handle, logging.Logger):
+            for level, timestamp, kind, payload in batch:
+                _write_message(self.handle, level, timestamp, _MESSAGE_BUILDERS[kind](*payload))
+            return
+        lines = [
+            f"[{_format_time(timestamp)}] {level}: {_MESSAGE_BUILDERS[kind](*payload)}\n"
+            for level, timestamp, kind, payload in batch
+        ]
+        self.handle.write("".join(lines))
+
+    def _flush_handle(self):
+        if hasattr(self.handle, 'flush'):
+            self.handle.flush()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        dirty = False
+        stop = False
+        while not stop:
+            batch = []
+            received = 0
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                received += 1
+                stop = item is self._STOP
+                if not stop:
+                    batch.append(item)
+                """Забираем все, что уже накопилось, одной пачкой"""
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    received += 1
+                    stop = item is self._STOP
+                    if not stop:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    sys.stderr.write(f"AsyncLogWriter: {type(e).__name__}: {e}\n")
+                dirty = True
+            if dirty and (stop or self._queue.empty()
+                          or time.monotonic() - last_flush >= self.flush_interval):
+                self._flush_handle()
+                last_flush = time.monotonic()
+                dirty = False
+            for _ in range(received):
+                self._queue.task_done()
+
+    def flush(self):
+        """Ждет, пока все записи из очереди будут записаны и сброшены."""
+        if not self._closed:
+            self._queue.join()
+            self._flush_handle()
+
+    def close(self):
+        """Дописывает очередь и останавливает фоновый поток (повторный вызов безопасен)."""
+        if self._closed:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._closed = True
+        self._flush_handle()
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в наносекундах в стиле HDR: значения до 2**sub_bits
+    хранятся точно, дальше каждый интервал [2**k, 2**(k+1)) делится на
+    2**(sub_bits - 1) корзин, поэтому относительная ошибка квантилей не
+    превышает 2**(1 - sub_bits) (менее 1% при sub_bits=8), а память зависит
+    только от разброса значений, а не от числа вызовов.
+    """
+
+    def __init__(self, sub_bits=8):
+        self.sub_bits = sub_bits
+        self._half = 1 << (sub_bits - 1)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        shift = max(0, value.bit_length() - self.sub_bits)
+        return (shift * self._half) + (value >> shift)
+
+    def _bounds(self, index):
+        """Границы корзины [low, high]"""
+        if index < 2 * self._half:
+            return index, index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        """Значение p-го процентиля (середина корзины, не больше max)"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """Сводка в виде словаря (для JSON)"""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class FunctionMetrics:
+    """Счетчики и гистограммы одной функции: стена (perf_counter_ns) и CPU (thread_time_ns)."""
+
+    def __init__(self, sub_bits=8):
+        self.calls = 0
+        self.errors = 0
+        self.wall = LatencyHistogram(sub_bits)
+        self.cpu = LatencyHistogram(sub_bits)
+
+    def summary(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_ns": self.wall.summary(),
+            "cpu_ns": self.cpu.summary(),
+        }
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик декоратора logger(metrics=...). Метрики собираются по
+    имени функции (__qualname__); сводку можно получить словарем (snapshot),
+    записать строкой JSON (dump) или писать периодически из фонового потока
+    (start/stop).
+    """
+
+    def __init__(self, sub_bits=8):
+        self.sub_bits = sub_bits
+        self.functions = {}
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+
+    def record(self, name, wall_ns, cpu_ns=None, error=False):
+        with self._lock:
+            metrics = self.functions.get(name)
+            if metrics is None:
+                metrics = self.functions[name] = FunctionMetrics(self.sub_bits)
+            metrics.calls += 1
+            metrics.errors += error
+            metrics.wall.record(wall_ns)
+            if cpu_ns is not None:
+                metrics.cpu.record(cpu_ns)
+
+    def snapshot(self):
+        with self._lock:
+            functions = {name: m.summary() for name, m in self.functions.items()}
+        return {"timestamp": datetime.now().isoformat(timespec="seconds"), "functions": functions}
+
+    def dump(self, handle=sys.stdout):
+        """Записывает сводку одной строкой JSON и возвращает ее"""
+        line = json.dumps(self.snapshot(), ensure_ascii=False)
+        handle.write(line + "\n")
+        if hasattr(handle, 'flush'):
+            handle.flush()
+        return line
+
+    def reset(self):
+        with self._lock:
+            self.functions.clear()
+
+    def start(self, interval=60.0, handle=sys.stderr):
+        """Запускает периодическую запись сводки; при выходе пишется последняя"""
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+        def run(stop):
+            while not stop.wait(interval):
+                self.dump(handle)
+            self.dump(handle)
+        self._thread = threading.Thread(target=run, args=(self._stop,), name="MetricsRegistry", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Останавливает периодическую запись (повторный вызов безопасен)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+_SHARED_WRITERS = {}
+_SHARED_WRITERS_LOCK = threading.Lock()
+
+
+def shared_writer(handle, maxsize=10000):
+    """
+    Общий AsyncLogWriter для handle: все корутины, пишущие в один handle,
+    используют один фоновый поток, а не создают по потоку на функцию.
+    """
+    with _SHARED_WRITERS_LOCK:
+        writer = _SHARED_WRITERS.get(id(handle))
+        if writer is None or writer.handle is not handle or writer._closed:
+            writer = _SHARED_WRITERS[id(handle)] = AsyncLogWriter(handle, maxsize=maxsize, policy="drop")
+        return writer
+
+
+""" Общий реестр по умолчанию для logger(metrics=True) """
+METRICS = MetricsRegistry()
+
+
+def logger(func=None, *, handle=sys.stdout, background=False, maxsize=10000, policy="block",
+           level=logging.INFO, sample_rate=1, max_repr=None, metrics=None):
     """
     Декоратор для логирования вызовов функций.
 
     Args:
         func: Декорируемая функция (если используется без скобок)
         handle: Цель для логирования (sys.stdout, io.StringIO, logging.Logger)
+            или AsyncLogWriter для фоновой записи
+        background: Обернуть handle в AsyncLogWriter (очередь maxsize, политика policy)
+        level: Минимальный уровень: INFO - вызовы и ошибки, ERROR - только ошибки,
+            выше ERROR - логирование выключено и функция не оборачивается
+        sample_rate: Логировать вызов и результат только для 1 из sample_rate вызовов
+            (ошибки пишутся всегда)
+        max_repr: Ограничение длины repr аргументов и результата
+        metrics: MetricsRegistry (или True для общего METRICS) - измерять время
+            каждого вызова (perf_counter_ns и thread_time_ns) и собирать
+            гистограммы задержек; работает и при выключенном логировании
+
+    Сообщения форматируются только для записей, которые действительно
+    пишутся: отброшенные уровнем или выборкой вызовы не вычисляют ни repr,
+    ни время. Для async def функций создается асинхронная обертка: она ждет
+    результат корутины и пишет лог только через AsyncLogWriter (общий для
+    handle, см. shared_writer), причем без ожидания: при полной очереди
+    запись отбрасывается, чтобы не останавливать цикл событий.
     """
+    if background and not isinstance(handle, AsyncLogWriter):
+        handle = AsyncLogWriter(handle, maxsize=maxsize, policy=policy)
+
     def decorator(f):
+        """Логирование выключено - возвращаем саму функцию, накладных расходов нет"""
+        registry = METRICS if metrics is True else (metrics or None)
+        if level > logging.ERROR and registry is None:
+            return f
+        name = f.__name__
+        metrics_name = f.__qualname__
+        fmt = _limited_repr(max_repr)
+        counter = itertools.count()
+        coroutine = inspect.iscoroutinefunction(f)
+        writer = handle
+        if coroutine and level <= logging.ERROR and not isinstance(writer, AsyncLogWriter):
+            writer = shared_writer(handle, maxsize)
+
+        if isinstance(writer, AsyncLogWriter):
+            """Запись откладывается: форматирует фоновый поток; корутина никогда не ждет очередь"""
+            block = not coroutine
+            def emit(record):
+                writer.put(record, block)
+        else:
+            def emit(record):
+                record_level, timestamp, kind, payload = record
+                _write_message(writer, record_level, timestamp, _MESSAGE_BUILDERS[kind](*payload))
+
+        def calls_enabled():
+            if level > logging.INFO:
+                return False
+            if isinstance(handle, logging.Logger) and not handle.isEnabledFor(logging.INFO):
+                return False
+            return sample_rate <= 1 or next(counter) % sample_rate == 0
+
+        """В записи кладется сырое время, строку из него собирает тот, кто пишет в handle"""
+        now = time.time
+
+        def failed(e, timestamp):
+            if level <= logging.ERROR:
+                emit(("ERROR", timestamp or now(), "error", (name, e)))
+
+        if coroutine:
+            @wraps(f)
+            async def coroutine_wrapper(*args, **kwargs):
+                logged = calls_enabled()
+                timestamp = now() if logged else None
+                if logged:
+                    emit(("INFO", timestamp, "call", (name, args, kwargs, fmt)))
+                """CPU-время корутины между await не отделить от других задач - только стена"""
+                start = time.perf_counter_ns() if registry is not None else 0
+                try:
+                    result = await f(*args, **kwargs)
+                except (Exception, asyncio.CancelledError) as e:
+                    """Отмену задачи тоже логируем, затем пробрасываем дальше"""
+                    if registry is not None:
+                        registry.record(metrics_name, time.perf_counter_ns() - start, error=True)
+                    failed(e, timestamp)
+                    raise
+                if registry is not None:
+                    registry.record(metrics_name, time.perf_counter_ns() - start)
+                if logged:
+                    emit(("INFO", timestamp, "return", (name, result, fmt)))
+                return result
+            coroutine_wrapper.log_writer = writer
+            return coroutine_wrapper
+
         @wraps(f)
         def wrapper(*args, **kwargs):
-            nonlocal handle
-            """Формируем строку с аргументами"""
-            args_repr = [repr(a) for a in args]
-            kwargs_repr = [f"{k}={v!r}" for k, v in kwargs.items()]
-            signature = ", ".join(args_repr + kwargs_repr)
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             """Логирование начала выполнения"""
-            start_msg = f"[{timestamp}] INFO: Function '{f.__name__}' called with args: ({signature})\n"
-            if isinstance(handle, logging.Logger):
-                handle.info(f"Function '{f.__name__}' called with args: ({signature})")
-            else:
-                handle.write(start_msg)
-                if hasattr(handle, 'flush'):
-                    handle.flush()
+            logged = calls_enabled()
+            timestamp = now() if logged else None
+            if logged:
+                emit(("INFO", timestamp, "call", (name, args, kwargs, fmt)))
+            if registry is not None:
+                start, cpu_start = time.perf_counter_ns(), time.thread_time_ns()
             try:
                 """Выполнение функции"""
                 result = f(*args, **kwargs)
-                """Логирование успешного завершения"""
-                end_msg = f"[{timestamp}] INFO: Function '{f.__name__}' returned: {result!r}\n"
-                if isinstance(handle, logging.Logger):
-                    handle.info(f"Function '{f.__name__}' returned: {result!r}")
-                else:
-                    handle.write(end_msg)
-                    if hasattr(handle, 'flush'):
-                        handle.flush()
-                return result
             except Exception as e:
-                """Логирование ошибки"""
-                error_msg = f"[{timestamp}] ERROR: Function '{f.__name__}' raised {type(e).__name__}: {str(e)}\n"
-                if isinstance(handle, logging.Logger):
-                    handle.error(f"Function '{f.__name__}' raised {type(e).__name__}: {str(e)}")
-                else:
-                    handle.write(error_msg)
-                    if hasattr(handle, 'flush'):
-                        handle.flush()
-                """Повторно выбрасываем исключение"""
+                """Логирование ошибки и повторный выброс исключения"""
+                if registry is not None:
+                    registry.record(metrics_name, time.perf_counter_ns() - start,
+                                    time.thread_time_ns() - cpu_start, error=True)
+                failed(e, timestamp)
                 raise
+            if registry is not None:
+                registry.record(metrics_name, time.perf_counter_ns() - start,
+                                time.thread_time_ns() - cpu_start)
+            """Логирование успешного завершения"""
+            if logged:
+                emit(("INFO", timestamp, "return", (name, result, fmt)))
+            return result
         return wrapper
     """Если декоратор используется без скобок: @logger"""
     if func is None:
@@ -119,7 +549,7 @@ def get_currencies(
 
 
 """ 3. Обернуть функцию декоратором """
-@logger(handle = sys.stdout)
+@logger(handle = sys.stdout, metrics = True)
 def get_currencies_decorated(
     currency_codes: List[str],
     url: str = "https://www.cbr-xml-daily.ru/daily_json.js"
@@ -284,6 +714,173 @@ class TestLoggerDecorator(unittest.TestCase):
         logs = self.stream.getvalue()
         self.assertIn("Вызов функции: complex_func(5, 30, b=20, extra='test')", logs)
 
+    def test_background_writer(self):
+        """Тест фоновой записи логов через очередь."""
+        writer = AsyncLogWriter(self.stream, flush_interval=0.01)
+        @logger(handle=writer)
+        def square(x):
+            return x * x
+        for i in range(100):
+            square(i)
+        writer.close()
+        logs = self.stream.getvalue()
+        self.assertEqual(logs.count("\n"), 200)
+        self.assertIn("Function 'square' returned: 9801", logs)
+
+    def test_background_record_is_cheap(self):
+        """В очередь кладется сырое время, строка времени собирается при записи."""
+        records = []
+        class Recorder(AsyncLogWriter):
+            def put(self, record, block=True):
+                records.append(record)
+                super().put(record, block)
+        writer = Recorder(self.stream)
+        logger(handle=writer)(abs)(-2)
+        writer.close()
+        self.assertTrue(all(isinstance(timestamp, float) for _, timestamp, _, _ in records))
+        self.assertRegex(self.stream.getvalue(), r"^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] INFO")
+
+    def test_background_writer_drop_policy(self):
+        """Тест политики drop при переполнении очереди."""
+        writer = AsyncLogWriter(self.stream, maxsize=1, policy="drop")
+        @logger(handle=writer)
+        def noop():
+            return None
+        for _ in range(1000):
+            noop()
+        writer.close()
+        written = self.stream.getvalue().count("\n")
+        self.assertEqual(written + writer.dropped, 2000)
+
+    def test_coroutine_logging(self):
+        """Тест логирования async def функции: результат и исключение корутины."""
+        @logger(handle=self.stream)
+        async def fetch(x):
+            await asyncio.sleep(0)
+            return x * 10
+        @logger(handle=self.stream)
+        async def broken():
+            await asyncio.sleep(0)
+            raise ValueError("bad rate")
+        self.assertTrue(inspect.iscoroutinefunction(fetch))
+        self.assertEqual(asyncio.run(fetch(4)), 40)
+        with self.assertRaises(ValueError):
+            asyncio.run(broken())
+        fetch.log_writer.close()
+        broken.log_writer.close()
+        logs = self.stream.getvalue()
+        self.assertIn("Function 'fetch' returned: 40", logs)
+        self.assertNotIn("coroutine object", logs)
+        self.assertIn("ERROR: Function 'broken' raised ValueError: bad rate", logs)
+
+    def test_coroutine_writer_shared_and_nonblocking(self):
+        """Корутины делят один поток записи и не ждут полную очередь."""
+        threads = threading.active_count()
+        fetchers = []
+        for _ in range(5):
+            @logger(handle=self.stream)
+            async def fetch(x):
+                return x
+            fetchers.append(fetch)
+        self.assertEqual(len({id(f.log_writer) for f in fetchers}), 1)
+        self.assertLessEqual(threading.active_count() - threads, 1)
+        fetchers[0].log_writer.close()
+
+        release = threading.Event()
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                release.wait()
+                return super().write(text)
+        writer = AsyncLogWriter(SlowStream(), maxsize=1, policy="block")
+        @logger(handle=writer)
+        async def noop(x):
+            return x
+        async def burst():
+            for i in range(50):
+                await noop(i)
+        """С блокирующим put цикл событий встал бы на второй записи"""
+        asyncio.run(asyncio.wait_for(burst(), timeout=5))
+        self.assertGreater(writer.dropped, 0)
+        release.set()
+        writer.close()
+        """После close корутина тоже не пишет в handle сама, а отбрасывает запись"""
+        dropped = writer.dropped
+        release.clear()
+        asyncio.run(asyncio.wait_for(noop(1), timeout=5))
+        self.assertEqual(writer.dropped, dropped + 2)
+        release.set()
+
+    def test_sampling_and_levels(self):
+        """Тест выборки 1 из N, минимального уровня и отключенного логирования."""
+        @logger(handle=self.stream, sample_rate=10)
+        def inc(x):
+            return x + 1
+        for i in range(100):
+            inc(i)
+        self.assertEqual(self.stream.getvalue().count("returned"), 10)
+        errors_only = io.StringIO()
+        @logger(handle=errors_only, level=logging.ERROR)
+        def check(x):
+            if x < 0:
+                raise ValueError("negative")
+            return x
+        check(1)
+        with self.assertRaises(ValueError):
+            check(-1)
+        self.assertEqual(errors_only.getvalue().count("\n"), 1)
+        self.assertIn("ERROR: Function 'check' raised ValueError", errors_only.getvalue())
+        def plain(x):
+            return x
+        self.assertIs(logger(handle=self.stream, level=logging.CRITICAL)(plain), plain)
+
+    def test_repr_size_cap(self):
+        """Тест ограничения длины repr для больших аргументов."""
+        @logger(handle=self.stream, max_repr=40)
+        def total(values):
+            return list(values)
+        total(list(range(100000)))
+        for line in self.stream.getvalue().splitlines():
+            self.assertLess(len(line), 200)
+        self.assertIn("...", self.stream.getvalue())
+
+    def test_metrics_mode(self):
+        """Тест сбора метрик: счетчики, квантили и JSON-сводка."""
+        registry = MetricsRegistry()
+        @logger(level=logging.CRITICAL, metrics=registry)
+        def check(x):
+            if x < 0:
+                raise ValueError("negative")
+            return x
+        for i in range(99):
+            check(i)
+        with self.assertRaises(ValueError):
+            check(-1)
+        self.assertEqual(self.stream.getvalue(), "")
+        stream = io.StringIO()
+        registry.dump(stream)
+        stats = json.loads(stream.getvalue())["functions"][check.__qualname__]
+        self.assertEqual((stats["calls"], stats["errors"]), (100, 1))
+        wall = stats["wall_ns"]
+        self.assertEqual(wall["count"], 100)
+        self.assertTrue(wall["min"] <= wall["p50"] <= wall["p95"] <= wall["p99"] <= wall["max"])
+
+    def test_metrics_disabled(self):
+        """Тест metrics=False: метрики не собираются, логирование работает."""
+        @logger(handle=self.stream, metrics=False)
+        def identity(x):
+            return x
+        self.assertEqual(identity(1), 1)
+        self.assertIn("returned: 1", self.stream.getvalue())
+        self.assertIs(logger(level=logging.CRITICAL, metrics=False)(len), len)
+
+    def test_histogram_precision(self):
+        """Тест точности квантилей гистограммы (относительная ошибка < 1%)."""
+        hist = LatencyHistogram()
+        for value in range(1, 100001):
+            hist.record(value * 1000)
+        for p in (50, 95, 99):
+            expected = p * 1000 * 1000
+            self.assertLess(abs(hist.percentile(p) - expected) / expected, 0.01)
 
 class TestStreamWrite(unittest.TestCase):
     """
@@ -360,8 +957,25 @@ def main():
     """ Уравнение без корней """ 
     print("\n3. Уравнение без корней:")
     demo_solve_quadratic(1, 2, 5)
-    
+
     """ Запуск тестов """
     unittest.main(argv=[''], verbosity=2, exit=False)
 
-main()
\ No newline at end of file
+
+def metrics_demo(calls=10000):
+    """ 6. Метрики: logger как профилировщик горячего пути """
+    print("\n6. Метрики solve_quadratic и get_currencies:")
+    profiled = logger(level=logging.CRITICAL, metrics=True)(solve_quadratic)
+    """Отключаем logging внутри solve_quadratic только на время замера"""
+    logging.disable(logging.CRITICAL)
+    try:
+        for i in range(calls):
+            profiled(1, -(i % 50), 6)
+    finally:
+        logging.disable(logging.NOTSET)
+    METRICS.dump(sys.stdout)
+
+main()
+
+if __name__ == "__main__":
+    metrics_demo()
\ No newline at end of file
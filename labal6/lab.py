@@ -1,6 +1,9 @@
-﻿import timeit
-import matplotlib.pyplot as plt
+﻿import os
+import sys
+import unittest
+from array import array
 from collections import deque, namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Any, Callable, Dict, List, Optional
 
 # Эти функции уже были даны в задании
@@ -63,6 +66,77 @@ def build_tree_recursive(
         'right': right_subtree
     }
 
+# Правила по умолчанию в виде обычных функций: лямбды нельзя передать в другой процесс
+def times_four(x):
+    return x * 4
+
+def plus_one(x):
+    return x + 1
+
+def _build_subtree_flat(height, root, left_branch, right_branch):
+    """Строит поддерево в процессе-исполнителе и возвращает его в порядке кучи"""
+    flat = [root]
+    level = [root]
+    for _ in range(height - 1):
+        children = []
+        for value in level:
+            children.append(left_branch(value))
+            children.append(right_branch(value))
+        flat.extend(children)
+        level = children
+    # компактная передача между процессами: array('q'), если значения помещаются в int64
+    try:
+        return array('q', flat)
+    except (TypeError, OverflowError):
+        return flat
+
+def _flat_to_dict(flat) -> Dict[str, Any]:
+    """Собирает словарное дерево из массива в порядке кучи"""
+    nodes = [{'value': value, 'left': None, 'right': None} for value in flat]
+    for i in range(len(nodes) // 2):
+        nodes[i]['left'] = nodes[2 * i + 1]
+        nodes[i]['right'] = nodes[2 * i + 2]
+    return nodes[0]
+
+def build_tree_parallel(
+    height: int = 4,
+    root: int = 4,
+    left_branch: Callable[[Any], Any] = times_four,
+    right_branch: Callable[[Any], Any] = plus_one,
+    levels: int = 3,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """Параллельный метод: верхние levels уровней строятся последовательно,
+    2**levels поддеревьев - в пуле процессов (left_branch и right_branch должны
+    сериализоваться pickle), затем поддеревья подвешиваются под верхнюю часть"""
+    if height <= levels + 1:
+        return build_tree_iterative(height, root, left_branch, right_branch)
+    tree = {'value': root, 'left': None, 'right': None}
+    frontier = [tree]
+    # верхние уровни - последовательно; последний из них станет корнями поддеревьев
+    for _ in range(levels):
+        next_frontier = []
+        for node in frontier:
+            node['left'] = {'value': left_branch(node['value']), 'left': None, 'right': None}
+            node['right'] = {'value': right_branch(node['value']), 'left': None, 'right': None}
+            next_frontier += [node['left'], node['right']]
+        frontier = next_frontier
+    sub_height = height - levels
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            pool.submit(_build_subtree_flat, sub_height, node['value'], left_branch, right_branch)
+            for node in frontier
+        ]
+        for node, future in zip(frontier, futures):
+            subtree = _flat_to_dict(future.result())
+            node['left'], node['right'] = subtree['left'], subtree['right']
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return tree
+
 # Функция для подсчета количества узлов в дереве
 def count_nodes(tree):
     """Простая функция для подсчета узлов в дереве"""
@@ -76,49 +150,117 @@ def count_nodes(tree):
     return count
 
 # Функция для замера времени
-def measure_time(func, height, number=100):
-    """Замеряет время выполнения функции"""
-    times = timeit.repeat(
-        lambda: func(height=height, root=4, left_branch=lambda x: x*4, right_branch=lambda x: x+1),
+def measure_tree(func, height, number=None, repeat=7, **kwargs) -> "bench.Measurement":
+    """Полный замер построения дерева: медиана, IQR и доверительный интервал"""
+    import bench
+    return bench.measure(
+        lambda: func(height=height, root=4, left_branch=times_four, right_branch=plus_one, **kwargs),
+        name=func.__name__,
+        param=height,
         number=number,
-        repeat=3
+        repeat=repeat
     )
-    return min(times)  # берем минимальное время
+
+def measure_time(func, height, number=None):
+    """Замеряет время одного построения дерева (медиана, сек)"""
+    return measure_tree(func, height, number=number).median
+
+# Тесты
+class TestBuildTreeParallel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_matches_iterative(self):
+        """Параллельное дерево совпадает с последовательным при разных height и levels"""
+        for height, levels in [(0, 3), (1, 3), (4, 3), (5, 1), (6, 2), (7, 3), (8, 4)]:
+            with self.subTest(height=height, levels=levels):
+                expected = build_tree_iterative(height, 4, times_four, plus_one)
+                tree = build_tree_parallel(height, 4, levels=levels, executor=self.pool)
+                self.assertEqual(tree, expected)
+
+    def test_values_past_int64(self):
+        """Значения вне int64 передаются из процесса списком, а не array('q')"""
+        tree = build_tree_parallel(6, 2 ** 62, levels=2, executor=self.pool)
+        self.assertEqual(tree, build_tree_iterative(6, 2 ** 62, times_four, plus_one))
+        self.assertIsInstance(_build_subtree_flat(3, 2 ** 62, times_four, plus_one), list)
+        self.assertIsInstance(_build_subtree_flat(3, 1, times_four, plus_one), array)
+
+    def test_own_pool(self):
+        """Без executor пул создается и закрывается самим вызовом"""
+        tree = build_tree_parallel(6, 1, levels=2, workers=2)
+        self.assertEqual(count_nodes(tree), 2 ** 6 - 1)
+        self.assertEqual(tree, build_tree_iterative(6, 1, times_four, plus_one))
 
 if __name__ == "__main__":
+    # при запуске скриптом корень репозитория (bench.py) не виден для импорта
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import bench
+    unittest.main(argv=[''], verbosity=2, exit=False)
     # Тестируем разные высоты
     heights = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
     iter_times = []
     rec_times = []
+    par_times = []
+    measurements = []
+    # один пул на все замеры, чтобы не мерить запуск процессов
+    pool = ProcessPoolExecutor()
 
-    print("\nВысота | Узлов | Нерекурсивный | Рекурсивный | Во сколько раз")
-    print("-" * 65)
+    print("\nВысота | Узлов | Нерекурсивный | Рекурсивный | Параллельный | Во сколько раз")
+    print("-" * 80)
     for h in heights:
         # Считаем сколько узлов должно быть в дереве
         nodes = 2**h - 1
         # Замеряем время
-        t_iter = measure_time(build_tree_iterative, h)
-        t_rec = measure_time(build_tree_recursive, h)
+        m_iter = measure_tree(build_tree_iterative, h)
+        m_rec = measure_tree(build_tree_recursive, h)
+        m_par = measure_tree(build_tree_parallel, h, executor=pool)
+        measurements += [m_iter, m_rec, m_par]
+        t_iter, t_rec, t_par = m_iter.median, m_rec.median, m_par.median
         iter_times.append(t_iter)
         rec_times.append(t_rec)
+        par_times.append(t_par)
         # Сравниваем
         if t_rec > t_iter:
             faster = f"в {t_rec/t_iter:.2f} раза быстрее итер"
         else:
             faster = f"в {t_iter/t_rec:.2f} раза быстрее рекур"
-        print(f"{h:6} | {nodes:5} | {t_iter:.8f} | {t_rec:.8f} | {faster}")
+        print(f"{h:6} | {nodes:5} | {t_iter:.8f} | {t_rec:.8f} | {t_par:.8f} | {faster}")
+    pool.shutdown()
 
     # Считаем среднее значение для последних нескольких замеров
     avg_ratio = sum(rec_times[i]/iter_times[i] for i in range(len(heights)-3, len(heights))) / 3
     print(f"\nДля больших деревьев рекурсивный метод медленнее примерно в {avg_ratio:.2f} раза")
 
-    # Рисуем график
+    # Сохраняем замеры и сравниваем с предыдущим запуском
+    results_path = "bench_labal6.json"
+    if os.path.exists(results_path):
+        for name, h, old, new, ratio in bench.find_regressions(bench.load_results(results_path), measurements):
+            print(f"Регрессия: {name}(height={h}) {old:.8f} -> {new:.8f} (x{ratio:.2f})")
+    bench.save_results(measurements, results_path)
+
+    # Память: пик во время построения и байт на узел готового дерева
+    memory = [
+        bench.measure_memory(lambda f=func, h=h: f(height=h), name=func.__name__, param=h, items=2**h - 1)
+        for func in (build_tree_iterative, build_tree_recursive)
+        for h in heights
+    ]
+    print()
+    print(bench.format_memory_table(memory))
+
+    # Рисуем график (matplotlib нужен только здесь)
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(12, 5))
 
     # График 1: обычный
     plt.subplot(1, 2, 1)
     plt.plot(heights, iter_times, 'o-', label='Нерекурсивный', linewidth=2, color='blue')
     plt.plot(heights, rec_times, 's-', label='Рекурсивный', linewidth=2, color='red')
+    plt.plot(heights, par_times, '^-', label='Параллельный', linewidth=2, color='green')
     plt.xlabel('Высота дерева')
     plt.ylabel('Время построения дерева')
     plt.title('Зависимость времени от высоты дерева')
@@ -1,5 +1,12 @@
 import pytest 
-from lab import sum_of_two
+import array
+import random
+import time
+import bench
+from lab import np, sum_of_two, sum_of_two_brute, sum_of_two_many, sum_of_two_stream, SumOfTwoIndex
+from lab import parallel_speedup
+
+needs_numpy = pytest.mark.skipif(np is None, reason="numpy не установлен")
 
 def test_sum_of_two_ex1():
   nums = [2, 7, 11, 15]
@@ -25,3 +32,139 @@ def test_sum_of_two_ex4():
   expected = [0, 2]
   assert sum_of_two(nums, target) == expected
 
+def test_sum_of_two_hash_matches_brute():
+  rnd = random.Random(1)
+  for _ in range(200):
+    nums = [rnd.randint(-10, 10) for _ in range(rnd.randint(0, 12))]
+    target = rnd.randint(-20, 20)
+    assert sum_of_two(nums, target) == sum_of_two_brute(nums, target)
+
+def test_sum_of_two_index_many():
+  nums = [0, 4, 6, 10]
+  index = SumOfTwoIndex(nums)
+  assert index.query(10) == [0, 3]
+  assert index.query(100) == []
+  assert sum_of_two_many(nums, [10, 14, 5]) == [[0, 3], [1, 3], []]
+
+@needs_numpy
+def test_sum_of_two_numpy_matches_brute():
+  rnd = random.Random(2)
+  for _ in range(200):
+    nums = [rnd.randint(-10, 10) for _ in range(rnd.randint(0, 12))]
+    target = rnd.randint(-20, 20)
+    assert sum_of_two(np.array(nums, dtype=np.int64), target) == sum_of_two_brute(nums, target)
+
+@needs_numpy
+def test_sum_of_two_numpy_many_and_array_buffer():
+  nums = [0, 3, 0, 0, 7, 3]
+  targets = list(range(-2, 16))
+  expected = [sum_of_two_brute(nums, t) for t in targets]
+  assert sum_of_two_many(array.array("q", nums), targets) == expected
+  assert sum_of_two(array.array("i", nums), 0) == [0, 2]
+
+@needs_numpy
+def test_sum_of_two_numpy_narrow_buffers_do_not_wrap():
+  assert sum_of_two(array.array("B", [2, 255]), 1) == sum_of_two_brute([2, 255], 1) == []
+  assert sum_of_two(array.array("B", [200, 100, 56]), 256) == [0, 2]
+  big = [2**31 - 1, 1]
+  assert sum_of_two(array.array("i", big), -2**31) == sum_of_two_brute(big, -2**31) == []
+  assert sum_of_two(array.array("i", big), 2**31) == [0, 1]
+  assert sum_of_two(array.array("i", [1, 2]), 2**40) == []
+  assert sum_of_two(array.array("q", [2**62, 2**62]), 2**63) == [0, 1]
+  assert sum_of_two_many(array.array("B", [2, 255]), [1, 257, 2**70]) == [[], [0, 1], []]
+
+@needs_numpy
+def test_sum_of_two_numpy_int64_complements_do_not_wrap():
+  extreme = [-(2**63) + 1, -(2**62) - 1]
+  data = np.array(extreme, dtype=np.int64)
+  assert sum_of_two(data, 2**62) == sum_of_two_brute(extreme, 2**62) == []
+  assert sum_of_two_many(data, [2**62, sum(extreme)]) == [[], [0, 1]]
+  huge = [2**64 - 2, 1, 2**63]
+  unsigned = np.array(huge, dtype=np.uint64)
+  assert sum_of_two(unsigned, 2**64 - 1) == sum_of_two_brute(huge, 2**64 - 1) == [0, 1]
+  assert sum_of_two(unsigned, 5) == []
+
+def test_sum_of_two_stream_iterator():
+  result = sum_of_two_stream(iter([2, 7, 11, 15]), 9)
+  assert result.pair == [0, 1]
+  assert result.scanned == 2
+  assert sum_of_two_stream(iter([0, 3, 0, 0]), 0).pair == [0, 2]
+  missing = sum_of_two_stream(iter(range(5000)), -1, chunk_size=100)
+  assert missing.pair == []
+  assert missing.scanned == 5000
+  assert missing.table_bytes > 0
+  peak = bench.measure_memory(lambda: sum_of_two_stream(iter(range(5000)), -1, chunk_size=100))
+  assert peak.peak_bytes >= missing.table_bytes
+
+def test_sum_of_two_stream_rejects_floats():
+  with pytest.raises(ValueError):
+    sum_of_two_stream(iter([1.2, 1.9]), 2)
+  assert sum_of_two_stream(iter([1.0, 1.0]), 2).pair == [0, 1]
+  with pytest.raises(ValueError):
+    sum_of_two_stream(iter([1, 2**63]), 0)
+
+def test_sum_of_two_stream_strided_keys():
+  # ключи с общим шагом 2**16 не должны собираться в нескольких слотах
+  start = time.perf_counter()
+  strided = sum_of_two_stream(iter(range(0, 20000 * 65536, 65536)), -1)
+  assert strided.pair == []
+  assert strided.scanned == 20000
+  assert time.perf_counter() - start < 5
+  assert sum_of_two_stream(iter(range(0, 20000 * 65536, 65536)), 65536 * 19999).pair == [9999, 10000]
+
+def test_sum_of_two_stream_file(tmp_path):
+  path = tmp_path / "nums.bin"
+  path.write_bytes(array.array("q", [5, -4, 8, 1, 3]).tobytes())
+  assert sum_of_two_stream(path, 4, chunk_size=2).pair == [1, 2]
+
+@needs_numpy
+def test_sum_of_two_parallel_matches_brute():
+  rnd = random.Random(3)
+  for _ in range(10):
+    nums = [rnd.randint(-10, 10) for _ in range(rnd.randint(0, 12))]
+    target = rnd.randint(-20, 20)
+    assert sum_of_two(nums, target, method="parallel", workers=2) == sum_of_two_brute(nums, target)
+  assert sum_of_two(array.array("B", [2, 255, 3]), 5, method="parallel", workers=3) == [0, 2]
+  with pytest.raises(TypeError):
+    sum_of_two([1.5, 2.5], 4, method="parallel", workers=2)
+  extreme = np.array([-(2**63) + 1, -(2**62) - 1], dtype=np.int64)
+  assert sum_of_two(extreme, 2**62, method="parallel", workers=2) == []
+
+@needs_numpy
+def test_parallel_speedup_curve():
+  curve = parallel_speedup(list(range(1000)), -1, [1, 2])
+  assert [workers for workers, _, _ in curve] == [1, 2]
+  assert curve[0][2] == 1.0
+  assert all(seconds > 0 for _, seconds, _ in curve)
+
+def test_bench_measure_and_roundtrip(tmp_path):
+  result = bench.measure(lambda: sum(range(100)), name="sum", param=100, repeat=5, min_time=0.01)
+  assert result.number >= 1
+  assert len(result.times) == 5
+  assert result.ci_low <= result.median <= result.ci_high
+  path = tmp_path / "bench.json"
+  bench.save_results([result], str(path))
+  assert bench.load_results(str(path)) == [result]
+
+def test_bench_find_regressions():
+  old = bench.summarize("f", 10, 1, [1.0, 1.0, 1.1, 0.9, 1.0])
+  slow = bench.summarize("f", 10, 1, [2.0, 2.1, 1.9, 2.0, 2.0])
+  assert bench.find_regressions([old], [slow])[0][:2] == ("f", 10)
+  assert bench.find_regressions([old], [old]) == []
+
+def test_bench_cli_run(tmp_path):
+  json_path = tmp_path / "out.json"
+  csv_path = tmp_path / "out.csv"
+  code = bench.main(["run", "factorial", "--sizes", "10", "--only", "iterative",
+                     "--repeat", "3", "--min-time", "0.001",
+                     "--json", str(json_path), "--csv", str(csv_path)])
+  assert code == 0
+  results = bench.load_results(str(json_path))
+  assert [m.name for m in results] == ["laba4.fact_iterative"]
+  assert csv_path.read_text(encoding="utf-8").startswith("name,param")
+
+def test_bench_measure_memory():
+  result = bench.measure_memory(lambda: [0] * 10000, name="list", param=1, items=10000)
+  assert result.retained_bytes >= 80000
+  assert result.peak_bytes >= result.retained_bytes
+  assert 8 <= result.bytes_per_item < 16